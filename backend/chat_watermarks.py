@@ -0,0 +1,155 @@
+import hashlib
+import zipfile
+from collections import deque
+from itertools import chain, islice, repeat
+from typing import BinaryIO, Callable, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from whatsapp_parser import STREAM_READ_SIZE, chat_archive_members, is_zip_archive
+
+# Leading lines that identify a chat across re-exports. Shorter chats are
+# not fingerprinted and are always parsed in full
+FINGERPRINT_LINES = 20
+
+# Trailing lines hashed into a watermark to confirm a re-export still starts
+# with the lines an earlier import covered
+TAIL_LINES = 5
+
+class Watermark(NamedTuple):
+    """
+    How far an earlier import read a chat: its line count, up to the last
+    non-empty line, and a hash of the lines just before that point.
+    """
+    line_count: int
+    tail_hash: str
+
+class ChatRead(NamedTuple):
+    """What one import read of a chat, to store as its new watermark"""
+    fingerprint: Optional[str]
+    watermark: Watermark
+    tail: List[str]  # the lines hashed into watermark
+    lines_skipped: int
+
+def _hash_lines(lines: Iterable[str]) -> str:
+    return hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+def chat_fingerprint(head_lines: List[str]) -> Optional[str]:
+    """Fingerprint of a chat from its first FINGERPRINT_LINES lines, or None if it has fewer"""
+    if len(head_lines) < FINGERPRINT_LINES:
+        return None
+    return _hash_lines(head_lines[:FINGERPRINT_LINES])
+
+def content_hash(source: Union[str, BinaryIO]) -> str:
+    """
+    Hash identifying an upload's chat content. Archives are hashed from the
+    CRCs and sizes of their chat members in the central directory, so media
+    is not read. Streams are left at their starting position.
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, str):
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    position = source.tell()
+    if is_zip_archive(source):
+        with zipfile.ZipFile(source) as archive:
+            for name in chat_archive_members(archive):
+                info = archive.getinfo(name)
+                digest.update(f"{name}\0{info.CRC}\0{info.file_size}\n".encode())
+    else:
+        for block in iter(lambda: source.read(STREAM_READ_SIZE), b""):
+            digest.update(block)
+    source.seek(position)
+    return digest.hexdigest()
+
+def content_fingerprint(content: str) -> Optional[str]:
+    head = content.split("\n", FINGERPRINT_LINES)
+    # A trailing newline does not start another line, as in iter_decoded_lines
+    if len(head) == FINGERPRINT_LINES and not head[-1]:
+        return None
+    return chat_fingerprint(head[:FINGERPRINT_LINES])
+
+def content_read(content: str, lines_skipped: int = 0) -> ChatRead:
+    """ChatRead for a chat parsed from decoded content, covering all of it"""
+    body = content.rstrip("\n")
+    line_count = body.count("\n") + 1 if body else 0
+    tail = body.rsplit("\n", TAIL_LINES)[-TAIL_LINES:] if body else []
+    return ChatRead(content_fingerprint(content), Watermark(line_count, _hash_lines(tail)), tail, lines_skipped)
+
+def covered_offset(content: str, watermark: Watermark) -> Optional[int]:
+    """
+    Offset in content just past the lines watermark covers, or None if
+    content does not start with those lines unchanged.
+    """
+    start = 0
+    for _ in range(watermark.line_count - 1):
+        newline = content.find("\n", start)
+        if newline == -1:
+            return None
+        start = newline + 1
+    end = content.find("\n", start)
+    if end == -1:
+        end = len(content)
+    if _hash_lines(content[:end].rsplit("\n", TAIL_LINES)[-TAIL_LINES:]) != watermark.tail_hash:
+        return None
+    return end + 1
+
+class ChatCursor:
+    """
+    Iterates one chat's lines for parsing, skipping the lines an earlier
+    import covered and tracking the watermark of everything read.
+
+    open_lines must return a fresh iterator over the chat each time it is
+    called. It is called again only if the lines covered by watermark turn
+    out to differ, in which case the chat is read in full.
+    """
+
+    def __init__(self, open_lines: Callable[[], Iterator[str]]):
+        self._open_lines = open_lines
+        self._lines = open_lines()
+        self._head = list(islice(self._lines, FINGERPRINT_LINES))
+        self.fingerprint = chat_fingerprint(self._head)
+        self.watermark: Optional[Watermark] = None  # set before iterating to resume after it
+        self.lines_skipped = 0
+        self._tail: deque = deque(maxlen=TAIL_LINES)
+        self._line_count = 0
+
+    def _track(self, lines: Iterable[str]) -> Iterator[str]:
+        """Yield lines, counting them up to the last non-empty one and keeping the tail"""
+        tail = self._tail
+        line_count = self._line_count
+        blanks = 0
+        for line in lines:
+            if line:
+                if blanks:
+                    tail.extend(repeat("", min(blanks, TAIL_LINES)))
+                    line_count += blanks
+                    blanks = 0
+                tail.append(line)
+                line_count += 1
+            else:
+                blanks += 1
+            yield line
+        self._line_count = line_count
+
+    def _skip_covered(self, lines: Iterator[str]) -> bool:
+        covered = self.watermark.line_count
+        for _ in self._track(islice(lines, covered)):
+            pass
+        return self._line_count == covered and _hash_lines(self._tail) == self.watermark.tail_hash
+
+    def __iter__(self) -> Iterator[str]:
+        lines = chain(self._head, self._lines)
+        self._head = []
+        if self.watermark is not None and self.watermark.line_count:
+            if self._skip_covered(lines):
+                self.lines_skipped = self.watermark.line_count
+            else:
+                self._tail.clear()
+                self._line_count = 0
+                lines = self._open_lines()
+        return self._track(lines)
+
+    def result(self) -> ChatRead:
+        """ChatRead covering every line read; valid once iteration is done"""
+        tail = list(self._tail)
+        return ChatRead(self.fingerprint, Watermark(self._line_count, _hash_lines(tail)), tail, self.lines_skipped)
@@ -0,0 +1,33 @@
+from datetime import date, datetime
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import Response
+
+def _default(obj: Any) -> Any:
+    """Encode the BSON and date types that appear in MongoDB documents"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as JSON. ObjectIds become strings and datetimes ISO 8601
+    strings, matching FastAPI's encoder, so documents can be returned as
+    read from MongoDB.
+    """
+    return orjson.dumps(content, default=_default)
+
+class FastJSONResponse(Response):
+    """
+    JSON response that skips FastAPI's response_model validation and
+    jsonable_encoder pass; content is encoded by dumps as is.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
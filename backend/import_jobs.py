@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class ImportJob:
+    """
+    Live progress of one import, updated by the code running it and read by
+    status requests. Parse progress may be reported from a worker thread.
+    """
+
+    def __init__(self, import_id: str, filename: str):
+        self.import_id = import_id
+        self.filename = filename
+        self.status = "processing"
+        self.lines_processed = 0
+        self.lines_skipped = 0
+        self.numbers_found = 0
+        self.leads_written = 0
+        self.result: Optional[Any] = None
+        self.error_message: Optional[str] = None
+        self.finished_at: Optional[datetime] = None
+
+    def on_parse_progress(self, lines_processed: int, numbers_found: int) -> None:
+        self.lines_processed = lines_processed
+        self.numbers_found = numbers_found
+
+    def on_leads_written(self, count: int) -> None:
+        self.leads_written += count
+
+    def finish(self, result: Any) -> None:
+        self.result = result
+        self.status = "completed"
+        self.finished_at = datetime.utcnow()
+
+    def fail(self, error_message: str) -> None:
+        self.error_message = error_message
+        self.status = "failed"
+        self.finished_at = datetime.utcnow()
+
+class ImportJobQueue:
+    """
+    Bounded queue of background imports, run by a fixed number of worker
+    tasks so concurrent imports cannot crowd out request handling.
+    Finished jobs are kept for result_ttl so clients can collect results.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 20, result_ttl: timedelta = timedelta(minutes=30)):
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self.queue: "asyncio.Queue" = asyncio.Queue(maxsize=max_pending)
+        self.jobs: Dict[str, ImportJob] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the worker tasks; must be called from the running event loop"""
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, job: ImportJob, run: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Queue run() to execute on a worker and track job until it expires.
+
+        Raises:
+            asyncio.QueueFull: if max_pending jobs are already waiting
+        """
+        self._prune()
+        self.queue.put_nowait((job, run))
+        self.jobs[job.import_id] = job
+
+    def get(self, import_id: str) -> Optional[ImportJob]:
+        return self.jobs.get(import_id)
+
+    def _prune(self) -> None:
+        cutoff = datetime.utcnow() - self.result_ttl
+        expired = [
+            import_id for import_id, job in self.jobs.items()
+            if job.finished_at and job.finished_at < cutoff
+        ]
+        for import_id in expired:
+            del self.jobs[import_id]
+
+    async def _worker(self) -> None:
+        while True:
+            job, run = await self.queue.get()
+            try:
+                await run()
+            except Exception as e:
+                logger.error(f"Import job {job.import_id} failed: {str(e)}")
+            finally:
+                self.queue.task_done()
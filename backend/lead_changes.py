@@ -0,0 +1,63 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List
+
+from pymongo import ReturnDocument
+
+class ChangeSequence:
+    """
+    Per-user sequence stamped on every lead write as change_seq, and on the
+    tombstones of deleted leads, so clients can ask for what changed after
+    the last sequence they saw.
+
+    Numbers are reserved in blocks before a write and the write runs while
+    its block is in flight. stable() only reports sequences below every
+    block still in flight, so a client can never move past a change that
+    has not been written yet. In-flight blocks are tracked in process, so
+    the API must run as a single process.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._in_flight: Dict[str, List[int]] = {}
+
+    def _lock(self, user_id: str) -> asyncio.Lock:
+        lock = self._locks.get(user_id)
+        if lock is None:
+            lock = self._locks[user_id] = asyncio.Lock()
+        return lock
+
+    @asynccontextmanager
+    async def reserve(self, user_id: str, count: int) -> AsyncIterator[int]:
+        """
+        Reserve count consecutive sequence numbers and yield the first one;
+        the writes stamped with them must be done before the block exits.
+        """
+        # Held until the block is registered, so stable() never sees the
+        # counter past a block it does not know is in flight
+        async with self._lock(user_id):
+            counter = await self.db.change_sequences.find_one_and_update(
+                {"_id": user_id},
+                {"$inc": {"last_seq": count}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            first = counter["last_seq"] - count + 1
+            self._in_flight.setdefault(user_id, []).append(first)
+        try:
+            yield first
+        finally:
+            in_flight = self._in_flight[user_id]
+            in_flight.remove(first)
+            if not in_flight:
+                del self._in_flight[user_id]
+
+    async def stable(self, user_id: str) -> int:
+        """Highest sequence number below which every change is written"""
+        async with self._lock(user_id):
+            in_flight = self._in_flight.get(user_id)
+            if in_flight:
+                return min(in_flight) - 1
+            counter = await self.db.change_sequences.find_one({"_id": user_id})
+            return counter["last_seq"] if counter else 0
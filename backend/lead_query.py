@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from lead_search import build_search_query
+from models import LeadFilterRequest
+
+# Filtered lead queries list the most recently first seen leads first;
+# _id breaks ties so pages can be resumed exactly
+FILTER_SORT = [("first_seen", DESCENDING), ("_id", DESCENDING)]
+
+# Indexes serving build_lead_filter_query with FILTER_SORT: equality fields
+# first, then the sort keys, which also bound the date range
+LEAD_QUERY_INDEXES = [
+    IndexModel(
+        [("user_id", ASCENDING), ("is_saved", ASCENDING), ("first_seen", DESCENDING), ("_id", DESCENDING)],
+        name="user_saved_first_seen"
+    ),
+    IndexModel(
+        [("user_id", ASCENDING), ("tags", ASCENDING), ("is_saved", ASCENDING),
+         ("first_seen", DESCENDING), ("_id", DESCENDING)],
+        name="user_tags_saved_first_seen"
+    ),
+]
+
+def build_lead_filter_query(user_id: str, lead_filter: Optional[LeadFilterRequest]) -> Dict[str, Any]:
+    """
+    Translate a LeadFilterRequest into a query on the leads collection.
+
+    is_saved is always constrained, to both values when the filter leaves it
+    open, so the date range and sort can use the index keys after it. A
+    search uses the (user_id, search_keys) index instead; a too short phone
+    search raises ValueError, as in build_search_query.
+    """
+    query: Dict[str, Any] = {"user_id": user_id}
+    if lead_filter is None or lead_filter.is_saved is None:
+        query["is_saved"] = {"$in": [False, True]}
+    else:
+        query["is_saved"] = lead_filter.is_saved
+    if lead_filter is None:
+        return query
+
+    if lead_filter.date_from or lead_filter.date_to:
+        query["first_seen"] = {}
+        if lead_filter.date_from:
+            query["first_seen"]["$gte"] = lead_filter.date_from
+        if lead_filter.date_to:
+            query["first_seen"]["$lte"] = lead_filter.date_to
+
+    if lead_filter.tags:
+        tags = list(dict.fromkeys(lead_filter.tags))
+        query["tags"] = tags[0] if len(tags) == 1 else {"$in": tags}
+
+    if lead_filter.search_query:
+        query.update(build_search_query(lead_filter.search_query) or {})
+
+    return query
+
+def query_after(query: Dict[str, Any], first_seen: datetime, lead_id: ObjectId) -> Dict[str, Any]:
+    """Narrow query to the leads after (first_seen, lead_id) in FILTER_SORT order"""
+    after: List[Dict[str, Any]] = [
+        {"first_seen": {"$lt": first_seen}},
+        {"first_seen": first_seen, "_id": {"$lt": lead_id}}
+    ]
+    return {"$and": [query, {"$or": after}]}
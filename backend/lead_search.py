@@ -0,0 +1,75 @@
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+# Leads store their search keys in this indexed array field
+SEARCH_KEYS_FIELD = "search_keys"
+
+# Length of the digit n-grams indexed for phone numbers
+PHONE_GRAM_SIZE = 3
+
+# Shorter digit searches are rejected: they have no n-gram to look up, and
+# keys for one or two digits would match nearly every lead anyway
+MIN_PHONE_SEARCH_DIGITS = PHONE_GRAM_SIZE
+
+# Name tokens are indexed by every prefix up to this length
+MAX_NAME_PREFIX = 16
+
+_NON_DIGITS = re.compile(r'\D')
+_TOKEN_SPLIT = re.compile(r'[^\w]+')
+_PHONE_QUERY = re.compile(r'^[\d\s+().-]+$')
+
+def fold_text(text: str) -> str:
+    """Lowercase and strip accents, e.g. 'Adéọlá' -> 'adeola'"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+def _phone_grams(digits: str) -> List[str]:
+    return [digits[i:i + PHONE_GRAM_SIZE] for i in range(len(digits) - PHONE_GRAM_SIZE + 1)]
+
+def _name_tokens(name: str) -> List[str]:
+    return [token for token in _TOKEN_SPLIT.split(fold_text(name)) if token]
+
+def build_search_keys(phone_number: str, display_name: Optional[str] = None) -> List[str]:
+    """
+    Build the indexed search keys for a lead: digit n-grams of the phone
+    number ("p:...") and every prefix of each folded name token ("n:...").
+    """
+    keys = {f"p:{gram}" for gram in _phone_grams(_NON_DIGITS.sub('', phone_number))}
+    if display_name:
+        for token in _name_tokens(display_name):
+            for end in range(1, min(len(token), MAX_NAME_PREFIX) + 1):
+                keys.add(f"n:{token[:end]}")
+    return sorted(keys)
+
+def build_search_query(search: str) -> Optional[Dict[str, Any]]:
+    """
+    Translate a search box string into a leads query served by the
+    (user_id, search_keys) index.
+
+    Digit-only input matches phone numbers containing those digits: the
+    n-gram keys narrow candidates through the index and a regex on the
+    remaining documents keeps the match exact. Any other input matches
+    leads whose name has a word starting with each search word.
+
+    Returns:
+        Query fragment, or None when the input has nothing to search on
+
+    Raises:
+        ValueError: if digit-only input has fewer than MIN_PHONE_SEARCH_DIGITS digits
+    """
+    if _PHONE_QUERY.match(search):
+        digits = _NON_DIGITS.sub('', search)
+        if not digits:
+            return None
+        if len(digits) < MIN_PHONE_SEARCH_DIGITS:
+            raise ValueError(f"Phone number searches need at least {MIN_PHONE_SEARCH_DIGITS} digits")
+        return {
+            "phone_number": {"$regex": re.escape(digits)},
+            SEARCH_KEYS_FIELD: {"$all": [f"p:{gram}" for gram in dict.fromkeys(_phone_grams(digits))]}
+        }
+
+    tokens = _name_tokens(search)
+    if not tokens:
+        return None
+    return {SEARCH_KEYS_FIELD: {"$all": [f"n:{token[:MAX_NAME_PREFIX]}" for token in dict.fromkeys(tokens)]}}
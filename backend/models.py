@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 from enum import Enum
 
@@ -28,18 +28,19 @@ class Subscription(BaseModel):
     expires_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class NamingConfig(BaseModel):
+    prefix: str = "Lead"
+    suffix: str = ""
+    auto_numbering: bool = True
+    number_start: int = 1
+
 class User(BaseModel):
     email: str
     password_hash: Optional[str] = None
     name: str
     google_id: Optional[str] = None
     subscription_tier: SubscriptionTier = SubscriptionTier.FREE
-    naming_config: Dict[str, Any] = Field(default_factory=lambda: {
-        "prefix": "Lead",
-        "suffix": "",
-        "auto_numbering": True,
-        "number_start": 1
-    })
+    naming_config: Dict[str, Any] = Field(default_factory=lambda: NamingConfig().dict())
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class Lead(BaseModel):
@@ -49,25 +50,45 @@ class Lead(BaseModel):
     source_chat: Optional[str] = None
     first_seen: datetime = Field(default_factory=datetime.utcnow)
     last_seen: datetime = Field(default_factory=datetime.utcnow)
-    import_id: str
+    import_id: str  # import that created the lead
+    import_ids: List[str] = Field(default_factory=list)  # every import that found the lead
     is_saved: bool = False
+    saved_name: Optional[str] = None  # contact name assigned by bulk-save
     tags: List[str] = Field(default_factory=list)
     notes: Optional[str] = None
+    search_keys: List[str] = Field(default_factory=list)  # see lead_search.build_search_keys
+    change_seq: int = 0  # see lead_changes.ChangeSequence
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class LeadTombstone(BaseModel):
+    user_id: str
+    lead_id: str  # _id of the deleted lead, kept so delta syncs remove it too
+    phone_number: str
+    change_seq: int
+    deleted_at: datetime = Field(default_factory=datetime.utcnow)
+
 class Import(BaseModel):
+    import_id: str
     user_id: str
     filename: str
     total_numbers: int = 0
     unsaved_count: int = 0
+    lines_processed: int = 0
+    lines_skipped: int = 0  # lines an earlier import of the same chat already covered
+    leads_written: int = 0
+    content_hash: Optional[str] = None  # see chat_watermarks.content_hash
+    duplicate_of: Optional[str] = None  # import with identical content, when nothing was parsed
     processed_at: datetime = Field(default_factory=datetime.utcnow)
-    status: str = "completed"  # processing, completed, failed
+    status: str = "completed"  # processing, completed, failed, rolled_back
     error_message: Optional[str] = None
+    rolled_back_at: Optional[datetime] = None
 
 # Request/Response Models
 class ImportUploadRequest(BaseModel):
     filename: str
     content: str  # base64 encoded file content
+    background: bool = False  # queue the import and return its import_id immediately
+    response_mode: str = "full"  # full: include every parsed lead, summary: counts only
 
 class ParsedLead(BaseModel):
     phone_number: str
@@ -80,6 +101,26 @@ class ImportParseResponse(BaseModel):
     total_count: int
     duplicates_removed: int
 
+class ImportSummaryResponse(BaseModel):
+    import_id: str
+    total_count: int
+    duplicates_removed: int
+
+class ImportJobResponse(BaseModel):
+    import_id: str
+    status: str
+
+class ImportStatusResponse(BaseModel):
+    import_id: str
+    filename: str
+    status: str
+    lines_processed: int = 0
+    lines_skipped: int = 0
+    numbers_found: int = 0
+    leads_written: int = 0
+    error_message: Optional[str] = None
+    result: Optional[Union[ImportParseResponse, ImportSummaryResponse]] = None  # while a finished background job is retained
+
 class LeadFilterRequest(BaseModel):
     date_from: Optional[datetime] = None
     date_to: Optional[datetime] = None
@@ -89,11 +130,20 @@ class LeadFilterRequest(BaseModel):
 
 class BulkSaveRequest(BaseModel):
     lead_ids: List[str]
-    naming_config: Optional[Dict[str, Any]] = None
+    naming_config: Optional[Dict[str, Any]] = None  # NamingConfig fields overriding the user's
+
+class BulkDeleteRequest(BaseModel):
+    lead_ids: Optional[List[str]] = None  # explicit selection, takes precedence over filter
+    filter: Optional[LeadFilterRequest] = None
 
 class ExportVCFRequest(BaseModel):
     lead_ids: List[str]
 
+class ExportStreamRequest(BaseModel):
+    lead_ids: Optional[List[str]] = None  # explicit selection, takes precedence over filter
+    filter: Optional[LeadFilterRequest] = None
+    gzip: bool = False
+
 class LeadStatsResponse(BaseModel):
     total_leads: int
     unsaved_leads: int
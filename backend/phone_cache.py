@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Returned by get() when a key is not cached (None is a cached negative result)
+MISSING = object()
+
+DEFAULT_MAX_SIZE = 100_000
+
+class PhoneNormalizationCache:
+    """
+    Bounded LRU cache of phone normalization results, keyed on the cleaned
+    candidate string. Invalid candidates are cached as None so they are not
+    re-validated either.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str):
+        """Return the cached result for key, or MISSING"""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Optional[str]) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Return size and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def load(self, path: Union[str, Path]) -> int:
+        """
+        Load entries saved by save(). A missing or unreadable file is ignored.
+
+        Returns:
+            Number of entries loaded
+        """
+        try:
+            with open(path, 'r') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load phone cache from {path}: {str(e)}")
+            return 0
+
+        # Entries are stored least recently used first
+        for key, value in list(entries.items())[-self.max_size:]:
+            self.put(key, value)
+        logger.info(f"Loaded {len(entries)} phone cache entries from {path}")
+        return len(entries)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the cache to path, replacing the previous file atomically"""
+        with self._lock:
+            entries = dict(self._entries)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved {len(entries)} phone cache entries to {path}")
+
+# Cache shared by every parser in this process
+shared_phone_cache = PhoneNormalizationCache()
@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from pymongo.errors import DuplicateKeyError
+
+from models import SUBSCRIPTION_TIERS, SubscriptionLimits, SubscriptionTier
+
+logger = logging.getLogger(__name__)
+
+# Usage counter field for each limited resource, and the limit that caps it
+LIMIT_FIELDS = {
+    "imports": "imports_per_month",
+    "contacts": "contacts_per_month",
+}
+
+# Limit value for unlimited tiers
+UNLIMITED = -1
+
+DEFAULT_LIMITS_TTL = 60.0
+
+class QuotaExceeded(Exception):
+    """Raised when a reservation would take a user over their monthly limit"""
+
+    def __init__(self, resource: str, limit: int):
+        self.resource = resource
+        self.limit = limit
+        super().__init__(f"Monthly {resource} limit of {limit} reached for your plan")
+
+def usage_id(user_id: str, now: Optional[datetime] = None) -> str:
+    """_id of the user's usage counters document for the month of now"""
+    return f"{user_id}:{(now or datetime.utcnow()).strftime('%Y-%m')}"
+
+class QuotaManager:
+    """
+    Monthly quota enforcement. Usage is kept in one counters document per
+    user and month, and a reservation checks and increments it in a single
+    conditional update. Tiers and limits are cached in process for
+    limits_ttl seconds; unlimited limits skip the database entirely.
+    """
+
+    def __init__(self, db, default_tier: SubscriptionTier = SubscriptionTier.FREE,
+                 limits_ttl: float = DEFAULT_LIMITS_TTL):
+        self.db = db
+        self.default_tier = default_tier
+        self.limits_ttl = limits_ttl
+        self._limits: Dict[str, Tuple[float, SubscriptionTier, SubscriptionLimits]] = {}
+        self._lock = threading.Lock()
+
+    async def plan(self, user_id: str) -> Tuple[SubscriptionTier, SubscriptionLimits]:
+        """The user's tier and limits, from the cache while fresh"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._limits.get(user_id)
+        if cached is not None and cached[0] > now:
+            return cached[1], cached[2]
+
+        subscription = await self.db.subscriptions.find_one(
+            {"user_id": user_id, "status": "active"}, {"tier": 1, "limits": 1}
+        )
+        if subscription is None:
+            tier = self.default_tier
+            limits = SUBSCRIPTION_TIERS[tier]
+        else:
+            tier = SubscriptionTier(subscription.get("tier", self.default_tier))
+            stored = subscription.get("limits")
+            limits = SubscriptionLimits(**stored) if stored else SUBSCRIPTION_TIERS[tier]
+
+        with self._lock:
+            self._limits[user_id] = (now + self.limits_ttl, tier, limits)
+        return tier, limits
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's cached limits, e.g. after their subscription changes"""
+        with self._lock:
+            self._limits.pop(user_id, None)
+
+    async def reserve(self, user_id: str, resource: str, amount: int = 1) -> None:
+        """
+        Add amount to the user's usage of resource this month, unless that
+        would exceed their limit.
+
+        Raises:
+            QuotaExceeded: if the reservation does not fit in the limit
+        """
+        _, limits = await self.plan(user_id)
+        limit = getattr(limits, LIMIT_FIELDS[resource])
+        if limit == UNLIMITED or amount <= 0:
+            return
+        if amount > limit:
+            raise QuotaExceeded(resource, limit)
+
+        # The filter only matches while there is room. When it does not match
+        # the upsert collides with the existing document, unless the document
+        # was just being created by a concurrent first reservation of the month
+        for _ in range(2):
+            try:
+                await self.db.usage.update_one(
+                    {"_id": usage_id(user_id), resource: {"$lte": limit - amount}},
+                    {"$inc": {resource: amount}, "$setOnInsert": {
+                        "user_id": user_id,
+                        # Every counter exists from the start, so the $lte filter can match it
+                        **{other: 0 for other in LIMIT_FIELDS if other != resource}
+                    }},
+                    upsert=True
+                )
+                return
+            except DuplicateKeyError:
+                continue
+        raise QuotaExceeded(resource, limit)
+
+    async def release(self, user_id: str, resource: str, amount: int = 1) -> None:
+        """Return an unused reservation, e.g. for an import that failed"""
+        if amount <= 0:
+            return
+        _, limits = await self.plan(user_id)
+        if getattr(limits, LIMIT_FIELDS[resource]) == UNLIMITED:
+            return
+        try:
+            await self.db.usage.update_one({"_id": usage_id(user_id)}, {"$inc": {resource: -amount}})
+        except Exception as e:
+            logger.error(f"Error releasing {resource} quota for {user_id}: {str(e)}")
+
+    async def usage(self, user_id: str) -> Dict[str, int]:
+        """The user's usage of each limited resource this month"""
+        document = await self.db.usage.find_one({"_id": usage_id(user_id)}) or {}
+        return {resource: document.get(resource, 0) for resource in LIMIT_FIELDS}
@@ -0,0 +1,105 @@
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple, Union
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# (user_id, data version, query)
+CacheKey = Tuple[str, int, Hashable]
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header lists etag (weak comparison, as for GET)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+class ReadCache:
+    """
+    Bounded LRU cache of encoded read responses, keyed on (user, data
+    version, query). Writes bump the user's data version instead of
+    evicting entries, so every key cached before a write stops matching at
+    once and the old entries age out of the LRU.
+
+    Versions are kept in process, like the import job queue, so the API
+    must run as a single process. ETags carry a per-process epoch so tags
+    issued before a restart never match.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions: Dict[str, int] = {}
+        self._entries: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.not_modified = 0
+
+    def key(self, user_id: str, query: Hashable) -> CacheKey:
+        """Key for query at the user's current data version; take it before reading"""
+        with self._lock:
+            return (user_id, self._versions.get(user_id, 0), query)
+
+    def bump(self, user_id: str) -> None:
+        """Record a write to the user's data; call once the write is complete"""
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def etag(self, key: CacheKey) -> str:
+        digest = hashlib.sha1(repr((key[0], key[2])).encode()).hexdigest()[:16]
+        return f'"{self.epoch}-{key[1]}-{digest}"'
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: CacheKey, body: bytes) -> None:
+        # A single response larger than the whole cache is not kept
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self.not_modified += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Return size and hit/miss/eviction/304 counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "not_modified": self.not_modified,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
@@ -1,30 +1,112 @@
-from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, APIRouter, HTTPException, Request, UploadFile, File, Form
+from fastapi.responses import Response, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import io
+import zlib
+import zipfile
+import asyncio
+import multiprocessing
 import logging
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Awaitable, BinaryIO, Callable, Hashable, Iterator, List, Optional, Dict, Any, Tuple, Union
 import uuid
 from datetime import datetime, timedelta
 import base64
+import csv
+import json
+import shutil
+import tempfile
 from bson import ObjectId
+from bson.errors import InvalidId
+from pydantic import ValidationError
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 
 from models import (
-    ImportUploadRequest, ImportParseResponse, LeadFilterRequest,
-    BulkSaveRequest, ExportVCFRequest, LeadStatsResponse,
-    Lead, Import, User, Subscription, ParsedLead,
-    SubscriptionTier, SUBSCRIPTION_TIERS
+    ImportUploadRequest, ImportParseResponse, ImportSummaryResponse, ImportJobResponse, ImportStatusResponse,
+    LeadFilterRequest,
+    BulkSaveRequest, BulkDeleteRequest, NamingConfig, ExportVCFRequest, ExportStreamRequest, LeadStatsResponse,
+    LeadTombstone, Import, ParsedLead, SubscriptionTier
 )
-from whatsapp_parser import WhatsAppParser
+from whatsapp_parser import (
+    WhatsAppParser, DEFAULT_CHUNK_SIZE, ZIP_MAGIC, LeadRecord, ParseStats, ProgressCallback,
+    chat_archive_members, is_zip_archive, iter_decoded_lines
+)
+from chat_watermarks import (
+    ChatCursor, ChatRead, Watermark, content_fingerprint, content_hash, content_read, covered_offset
+)
+from import_jobs import ImportJob, ImportJobQueue
+from lead_search import SEARCH_KEYS_FIELD, build_search_keys, build_search_query
+from lead_query import FILTER_SORT, LEAD_QUERY_INDEXES, build_lead_filter_query, query_after
+from phone_cache import shared_phone_cache, DEFAULT_MAX_SIZE as DEFAULT_PHONE_CACHE_SIZE
+from quotas import QuotaExceeded, QuotaManager
+from lead_changes import ChangeSequence
+from stats_writes import StatsWrites
+from fast_json import FastJSONResponse, dumps as json_dumps
+from read_cache import DEFAULT_MAX_BYTES as DEFAULT_READ_CACHE_BYTES, ReadCache, etag_matches
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry, MongoCommandMetrics, RequestMetricsMiddleware
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env', override=False)
 
+# Metrics served by /api/metrics in the Prometheus text format
+metrics = MetricsRegistry()
+request_latency = metrics.histogram(
+    "http_request_duration_seconds", "Request latency by route", ("method", "route")
+)
+requests_total = metrics.counter(
+    "http_requests_total", "Requests by route and status code", ("method", "route", "status")
+)
+mongo_metrics = MongoCommandMetrics(
+    duration=metrics.histogram(
+        "mongodb_command_duration_seconds", "MongoDB command latency by collection", ("command", "collection")
+    ),
+    failures=metrics.counter(
+        "mongodb_command_failures_total", "Failed MongoDB commands by collection", ("command", "collection")
+    )
+)
+parser_stage_seconds = metrics.counter(
+    "whatsapp_parser_stage_seconds_total", "Estimated time spent in each parser stage", ("stage",)
+)
+parser_lines = metrics.counter("whatsapp_parser_lines_total", "Chat lines parsed")
+parser_numbers = metrics.counter("whatsapp_parser_numbers_total", "Unique phone numbers extracted per import")
+parser_validations = metrics.counter(
+    "whatsapp_parser_phone_validations_total", "Phone candidates validated with phonenumbers (cache misses)"
+)
+metrics.callback("phone_cache_size", "Entries in the phone normalization cache", lambda: shared_phone_cache.stats()["size"])
+metrics.callback(
+    "phone_cache_hits_total", "Phone normalization cache hits", lambda: shared_phone_cache.stats()["hits"], kind="counter"
+)
+metrics.callback(
+    "phone_cache_misses_total", "Phone normalization cache misses", lambda: shared_phone_cache.stats()["misses"], kind="counter"
+)
+metrics.callback(
+    "phone_cache_evictions_total", "Phone normalization cache evictions",
+    lambda: shared_phone_cache.stats()["evictions"], kind="counter"
+)
+
+# Encoded lead list and stats responses, reused until the user's data changes
+read_cache = ReadCache(max_bytes=int(os.environ.get('READ_CACHE_BYTES', str(DEFAULT_READ_CACHE_BYTES))))
+metrics.callback("read_cache_size_bytes", "Bytes of responses in the read cache", lambda: read_cache.stats()["size_bytes"])
+metrics.callback("read_cache_hits_total", "Read cache hits", lambda: read_cache.stats()["hits"], kind="counter")
+metrics.callback("read_cache_misses_total", "Read cache misses", lambda: read_cache.stats()["misses"], kind="counter")
+metrics.callback(
+    "read_cache_evictions_total", "Read cache evictions", lambda: read_cache.stats()["evictions"], kind="counter"
+)
+metrics.callback(
+    "read_cache_not_modified_total", "Reads answered 304 from the client's ETag",
+    lambda: read_cache.stats()["not_modified"], kind="counter"
+)
+metrics.callback("read_cache_hit_rate", "Read cache hits per lookup", lambda: read_cache.stats()["hit_rate"])
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[mongo_metrics])
 db = client[os.environ['DB_NAME']]
 
 # Create the main app without a prefix
@@ -33,9 +115,70 @@ app = FastAPI(title="WhatsApp Lead Manager API", version="1.0.0")
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
+# Phone normalization cache shared by all parsers; optionally persisted
+# across restarts when PHONE_CACHE_PATH is set
+shared_phone_cache.max_size = int(os.environ.get('PHONE_CACHE_SIZE', str(DEFAULT_PHONE_CACHE_SIZE)))
+PHONE_CACHE_PATH = os.environ.get('PHONE_CACHE_PATH')
+
 # Initialize parser
 parser = WhatsAppParser()
 
+# Number of lead upserts sent to MongoDB per bulk_write round trip
+IMPORT_WRITE_BATCH_SIZE = int(os.environ.get('IMPORT_WRITE_BATCH_SIZE', '1000'))
+
+# Parse pool configuration: files larger than the threshold are parsed in
+# line-aligned chunks across PARSE_WORKERS processes (1 = disabled, the
+# default; 0 = one per core). Files within one chunk are parsed in process
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', '1')) or os.cpu_count() or 1
+PARSE_CHUNK_SIZE = int(os.environ.get('PARSE_CHUNK_SIZE', str(DEFAULT_CHUNK_SIZE)))
+PARSE_PARALLEL_THRESHOLD = int(os.environ.get('PARSE_PARALLEL_THRESHOLD', str(2 * DEFAULT_CHUNK_SIZE)))
+
+parse_pool: Optional[ProcessPoolExecutor] = None
+
+# Background imports: IMPORT_WORKERS run at once, up to IMPORT_QUEUE_SIZE wait
+import_jobs = ImportJobQueue(
+    workers=int(os.environ.get('IMPORT_WORKERS', '2')),
+    max_pending=int(os.environ.get('IMPORT_QUEUE_SIZE', '20')),
+    result_ttl=timedelta(minutes=int(os.environ.get('IMPORT_RESULT_TTL_MINUTES', '30')))
+)
+
+# Monthly quotas: users without an active subscription get DEFAULT_SUBSCRIPTION_TIER,
+# and tiers and limits are cached in process for QUOTA_LIMITS_TTL_SECONDS
+quotas = QuotaManager(
+    db,
+    default_tier=SubscriptionTier(os.environ.get('DEFAULT_SUBSCRIPTION_TIER', SubscriptionTier.FREE.value)),
+    limits_ttl=float(os.environ.get('QUOTA_LIMITS_TTL_SECONDS', '60'))
+)
+
+# Change sequence stamped on lead writes for delta syncs. Tombstones of
+# deleted leads are kept LEAD_TOMBSTONE_TTL_DAYS; sync tokens older than
+# that must start over with a full sync
+lead_changes = ChangeSequence(db)
+LEAD_TOMBSTONE_TTL = timedelta(days=int(os.environ.get('LEAD_TOMBSTONE_TTL_DAYS', '30')))
+
+# Counters in user_stats are rebuilt from the leads collection when older than this
+STATS_REBUILD_INTERVAL = timedelta(hours=int(os.environ.get('STATS_REBUILD_INTERVAL_HOURS', '24')))
+# Writes that move the counters, so a rebuild running beside one is not stored
+stats_writes = StatsWrites()
+
+# Leads fetched per cursor batch (and written per chunk) by streaming exports
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '5000'))
+
+# Columns of the CSV and NDJSON exports, in order
+EXPORT_FIELDS = ("phone_number", "display_name", "source_chat", "first_seen", "last_seen", "tags", "is_saved")
+
+# Import responses either list every parsed lead or only carry counts
+RESPONSE_MODES = ("full", "summary")
+
+# Fields left out of lead listings: internal search keys and the import history
+LEAD_LIST_PROJECTION = {SEARCH_KEYS_FIELD: 0, "import_ids": 0}
+
+# Fields a lead listing can be narrowed to with fields=
+LEAD_FIELDS = (
+    "user_id", "phone_number", "display_name", "source_chat", "first_seen", "last_seen", "import_id",
+    "is_saved", "saved_name", "tags", "notes", "change_seq", "created_at"
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -43,149 +186,1233 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Helper function to convert ObjectId to string
-def serialize_doc(doc: Dict) -> Dict:
-    """Convert MongoDB document to JSON-serializable format"""
-    if doc and "_id" in doc:
-        doc["_id"] = str(doc["_id"])
-    return doc
+def lead_projection(fields: Optional[str], required: Tuple[str, ...] = ()) -> Dict[str, int]:
+    """
+    MongoDB projection for a comma-separated fields parameter, plus the
+    required fields the endpoint needs itself; _id is always included.
+    Without fields, every field but the internal ones is returned.
+    """
+    if not fields:
+        return LEAD_LIST_PROJECTION
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in LEAD_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown lead fields: {', '.join(unknown)}")
+    return {field: 1 for field in (*required, *requested)}
 
-# ==================== IMPORT ENDPOINTS ====================
+async def cached_read(
+    request: Request, user_id: str, query: Hashable, load: Callable[[], Awaitable[Any]], refresh: bool = False
+) -> Response:
+    """
+    Answer a read from the read cache. For GET the ETag stands for the
+    user's data version and query, so a matching If-None-Match is answered
+    304 without a lookup; other methods always get the body. load() runs on
+    a miss (or when refresh is set) and its encoded result is cached.
+    """
+    key = read_cache.key(user_id, query)
+    conditional = request.method in ("GET", "HEAD")
+    headers = {"ETag": read_cache.etag(key), "Cache-Control": "no-cache"} if conditional else {}
+    if not refresh:
+        if conditional and etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            read_cache.record_not_modified()
+            return Response(status_code=304, headers=headers)
+        body = read_cache.get(key)
+        if body is not None:
+            return Response(content=body, media_type=FastJSONResponse.media_type, headers=headers)
+    
+    response = FastJSONResponse(await load(), headers=headers)
+    read_cache.put(key, response.body)
+    return response
 
-@api_router.post("/import/parse", response_model=ImportParseResponse)
-async def parse_import(request: ImportUploadRequest):
+def encode_page_token(lead: Dict, sort_field: str = "last_seen") -> str:
+    """Encode a lead's (sort_field, _id) sort key as an opaque pagination token"""
+    key = json.dumps([lead[sort_field].isoformat(), str(lead["_id"])])
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+def decode_page_token(token: str) -> Tuple[datetime, ObjectId]:
+    """Decode a pagination token produced by encode_page_token"""
+    sort_value, lead_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+    return datetime.fromisoformat(sort_value), ObjectId(lead_id)
+
+def encode_change_token(change_seq: int) -> str:
+    """Encode a delta sync position, with the time it was issued, as an opaque token"""
+    key = json.dumps([change_seq, datetime.utcnow().isoformat()])
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+def decode_change_token(token: str) -> Tuple[int, datetime]:
+    """Decode a sync token produced by encode_change_token"""
+    change_seq, issued_at = json.loads(base64.urlsafe_b64decode(token.encode()))
+    return int(change_seq), datetime.fromisoformat(issued_at)
+
+def parse_lead_ids(lead_ids: List[str]) -> List[ObjectId]:
+    """Parse lead ids from a request body, rejecting malformed ones with a 400"""
+    try:
+        return [ObjectId(lid) for lid in lead_ids]
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid lead id")
+
+def search_query(search: Optional[str]) -> Dict[str, Any]:
+    """Leads query fragment for a search box string, rejecting too short phone searches with a 400"""
+    try:
+        return (build_search_query(search) or {}) if search else {}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def lead_filter_query(user_id: str, lead_filter: Optional[LeadFilterRequest]) -> Dict[str, Any]:
+    """build_lead_filter_query, rejecting too short phone searches with a 400"""
+    try:
+        return build_lead_filter_query(user_id, lead_filter)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def format_vcard(lead: Dict) -> str:
+    """Render a lead as a vCard 3.0 entry"""
+    display_name = lead.get("saved_name") or lead.get("display_name") or lead.get("phone_number")
+    phone = lead.get("phone_number")
+    return (
+        "BEGIN:VCARD\n"
+        "VERSION:3.0\n"
+        f"FN:{display_name}\n"
+        f"TEL;TYPE=CELL:{phone}\n"
+        "END:VCARD\n"
+    )
+
+def build_contact_name(config: NamingConfig, lead: Dict, number: Optional[int] = None) -> str:
+    """Contact name for a saved lead: prefix, number, WhatsApp name and suffix joined by dashes"""
+    parts = [config.prefix]
+    if number is not None:
+        parts.append(f"{number:03d}")
+    display_name = lead.get("display_name")
+    if display_name and display_name != lead.get("phone_number"):
+        parts.append(display_name)
+    if config.suffix:
+        parts.append(config.suffix)
+    return "-".join(parts)
+
+async def reserve_contact_numbers(user_id: str, count: int) -> int:
     """
-    Parse uploaded WhatsApp chat file and extract phone numbers.
-    For MVP, user_id is hardcoded. Will be replaced with JWT auth in Phase 2.
+    Reserve count consecutive contact numbers for the user with one atomic
+    $inc, so concurrent bulk-saves never hand out the same number.
+    Returns the first reserved position in the user's sequence, from 1.
     """
+    counter = await db.naming_sequences.find_one_and_update(
+        {"_id": user_id},
+        {"$inc": {"last_number": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter["last_number"] - count + 1
+
+async def iter_export(
+    query: Dict[str, Any],
+    fields: Tuple[str, ...],
+    render: Callable[[List[Dict]], bytes],
+    header: bytes = b"",
+    compress: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Yield header, then render(batch) for each cursor batch of the leads
+    matching query, optionally gzip-compressed. The next batch is fetched
+    while one is rendered and compressed, off the event loop, and sent; at
+    most those two are held, so memory stays flat however many leads are
+    exported. The response has started by the time a batch fails, so errors
+    are logged here and end the stream early.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    
+    def encode(batch: List[Dict]) -> bytes:
+        chunk = render(batch)
+        return compressor.compress(chunk) if compressor else chunk
+    
+    cursor = db.leads.find(query, {"_id": 0, **{field: 1 for field in fields}}).batch_size(EXPORT_BATCH_SIZE)
+    
+    # to_list takes a whole batch without an await per lead
+    pending = asyncio.ensure_future(cursor.to_list(EXPORT_BATCH_SIZE))
     try:
-        # Decode base64 content
-        content = base64.b64decode(request.content).decode('utf-8')
-        
-        # Parse chat file
-        parsed_leads, sender_names = parser.parse_chat_file(content, request.filename)
-        
-        # Create import record
-        import_id = str(uuid.uuid4())
-        import_record = Import(
-            user_id="demo_user",  # MVP: hardcoded, will be from JWT in Phase 2
-            filename=request.filename,
-            total_numbers=len(parsed_leads),
-            unsaved_count=len(parsed_leads),  # Will be updated after contact checking
-            processed_at=datetime.utcnow(),
-            status="completed"
+        chunk = compressor.compress(header) if compressor else header
+        while True:
+            if chunk:
+                yield chunk
+            batch = await pending
+            if not batch:
+                break
+            pending = asyncio.ensure_future(cursor.to_list(EXPORT_BATCH_SIZE))
+            chunk = await asyncio.to_thread(encode, batch)
+        if compressor:
+            yield compressor.flush()
+    except Exception as e:
+        logger.error(f"Error exporting leads: {str(e)}")
+        raise
+    finally:
+        pending.cancel()
+        await cursor.close()
+
+def render_vcards(leads: List[Dict]) -> bytes:
+    return "".join(format_vcard(lead) for lead in leads).encode()
+
+def render_csv(leads: List[Dict]) -> bytes:
+    # Leads of one import share last_seen and often first_seen minutes, so
+    # each distinct timestamp is formatted once per batch
+    timestamps: Dict[Optional[datetime], str] = {None: ""}
+    
+    def timestamp(value: Optional[datetime]) -> str:
+        text = timestamps.get(value)
+        if text is None:
+            text = timestamps[value] = value.isoformat()
+        return text
+    
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        (
+            lead.get("phone_number"),
+            lead.get("display_name") or "",
+            lead.get("source_chat") or "",
+            timestamp(lead.get("first_seen")),
+            timestamp(lead.get("last_seen")),
+            ";".join(lead.get("tags") or ()),
+            "true" if lead.get("is_saved") else "false"
         )
+        for lead in leads
+    )
+    return buffer.getvalue().encode()
+
+def render_ndjson(leads: List[Dict]) -> bytes:
+    return b"".join(json_dumps(lead) + b"\n" for lead in leads)
+
+def iter_vcards(query: Dict[str, Any], compress: bool = False) -> AsyncIterator[bytes]:
+    """Yield vCards for the leads matching query, one cursor batch per chunk"""
+    return iter_export(query, ("phone_number", "display_name", "saved_name"), render_vcards, compress=compress)
+
+def get_parse_pool(size: int) -> Optional[ProcessPoolExecutor]:
+    """
+    Return the shared parse process pool for an input of size characters or
+    bytes, creating it on first use, or None if the input fits in one chunk.
+    Workers are spawned, not forked, since the server runs threads.
+    """
+    global parse_pool
+    if PARSE_WORKERS <= 1 or size <= PARSE_CHUNK_SIZE:
+        return None
+    if parse_pool is None:
+        parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return parse_pool
+
+def record_parse_stats(stats: ParseStats) -> None:
+    """Add one parse's counts and stage timings to the parser metrics"""
+    parser_lines.inc(stats.lines)
+    parser_numbers.inc(stats.numbers)
+    parser_validations.inc(stats.validations)
+    for stage, seconds in stats.stage_seconds.items():
+        parser_stage_seconds.inc(seconds, (stage,))
+
+async def find_watermarks(user_id: str, fingerprints: List[str]) -> Dict[str, Watermark]:
+    """Watermarks earlier imports left for these chats, by fingerprint"""
+    if not fingerprints:
+        return {}
+    cursor = db.chat_watermarks.find(
+        {"user_id": user_id, "fingerprint": {"$in": fingerprints}},
+        {"fingerprint": 1, "line_count": 1, "tail_hash": 1}
+    )
+    return {doc["fingerprint"]: Watermark(doc["line_count"], doc["tail_hash"]) async for doc in cursor}
+
+async def save_watermarks(user_id: str, chats: List[ChatRead], import_id: str) -> None:
+    """Record how far this import read each fingerprinted chat"""
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"user_id": user_id, "fingerprint": chat.fingerprint},
+            {"$set": {
+                "line_count": chat.watermark.line_count,
+                "tail_hash": chat.watermark.tail_hash,
+                "last_message_at": parser.last_message_time(chat.tail),
+                "import_id": import_id,
+                "updated_at": now
+            }},
+            upsert=True
+        )
+        for chat in chats if chat.fingerprint is not None
+    ]
+    if operations:
+        await db.chat_watermarks.bulk_write(operations, ordered=False)
+
+async def open_chat_cursors(user_id: str, openers: List[Callable[[], Iterator[str]]]) -> List[ChatCursor]:
+    """Start reading each chat and resume it from the watermark an earlier import left"""
+    cursors = await asyncio.to_thread(lambda: [ChatCursor(open_lines) for open_lines in openers])
+    watermarks = await find_watermarks(user_id, [cursor.fingerprint for cursor in cursors if cursor.fingerprint])
+    for cursor in cursors:
+        cursor.watermark = watermarks.get(cursor.fingerprint)
+    return cursors
+
+async def parse_chat_content(
+    content: str, filename: str, progress: Optional[ProgressCallback] = None
+) -> Tuple[List[LeadRecord], List[ChatRead]]:
+    """
+    Parse chat content without blocking the event loop, starting after the
+    lines an earlier import of the same chat already covered.
+    Large files are split across the parse process pool, which also
+    validates large batches of new phone candidates.
+    """
+    remainder = content
+    lines_skipped = 0
+    fingerprint = content_fingerprint(content)
+    watermark = (await find_watermarks("demo_user", [fingerprint] if fingerprint else [])).get(fingerprint)
+    if watermark is not None:
+        offset = await asyncio.to_thread(covered_offset, content, watermark)
+        if offset is not None:
+            remainder = content[offset:]
+            lines_skipped = watermark.line_count
+    
+    stats = ParseStats()
+    if len(remainder) >= PARSE_PARALLEL_THRESHOLD:
+        parsed_leads, _ = await asyncio.to_thread(
+            parser.parse_chat_file_parallel, remainder, filename, get_parse_pool(len(remainder)), PARSE_CHUNK_SIZE,
+            progress, stats
+        )
+    else:
+        parsed_leads, _ = await asyncio.to_thread(
+            parser.parse_chat_file, remainder, filename, progress, stats, get_parse_pool(len(remainder))
+        )
+    record_parse_stats(stats)
+    return parsed_leads, [await asyncio.to_thread(content_read, content, lines_skipped)]
+
+async def parse_chat_upload(
+    stream: BinaryIO, filename: str, progress: Optional[ProgressCallback] = None
+) -> Tuple[List[LeadRecord], List[ChatRead]]:
+    """
+    Parse an uploaded chat file line by line, starting after the lines an
+    earlier import of the same chat already covered.
+    """
+    def reopen() -> Iterator[str]:
+        stream.seek(0)
+        return iter_decoded_lines(stream)
+    
+    stats = ParseStats()
+    size = stream.seek(0, io.SEEK_END)
+    cursor, = await open_chat_cursors("demo_user", [reopen])
+    parsed_leads, _ = await asyncio.to_thread(
+        parser.parse_chat_stream, cursor, filename, progress, stats, get_parse_pool(size)
+    )
+    record_parse_stats(stats)
+    return parsed_leads, [cursor.result()]
+
+def check_chat_archive(source: BinaryIO, filename: str) -> None:
+    """
+    Reject an upload that is a zip archive without chat text, or a broken
+    one, with a 400 before an import is started for it. Only the archive's
+    directory is read and the stream is left where it was.
+    """
+    if not is_zip_archive(source):
+        return
+    position = source.tell()
+    try:
+        with zipfile.ZipFile(source) as archive:
+            names = chat_archive_members(archive)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail=f"{filename} is not a valid zip archive")
+    finally:
+        source.seek(position)
+    if not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"No chat text (.txt) found in {filename}; upload the .zip or .txt WhatsApp exports for a chat"
+        )
+
+async def parse_chat_archive(
+    archive_file: BinaryIO, filename: str, progress: Optional[ProgressCallback] = None
+) -> Tuple[List[LeadRecord], List[ChatRead]]:
+    """
+    Parse the chats in an exported WhatsApp archive as one import. Only the
+    chat text members are decompressed, a block at a time as they are
+    parsed; photos, videos and other media are never read. Each chat
+    starts after the lines an earlier import of it already covered.
+    """
+    stats = ParseStats()
+    with zipfile.ZipFile(archive_file) as archive, ExitStack() as members:
+        names = chat_archive_members(archive)
+        if not names:
+            raise ValueError(f"No chat text (.txt) found in {filename}")
+        cursors = await open_chat_cursors("demo_user", [
+            lambda name=name: iter_decoded_lines(members.enter_context(archive.open(name))) for name in names
+        ])
+        size = sum(archive.getinfo(name).file_size for name in names)
+        parsed_leads, _ = await asyncio.to_thread(
+            parser.parse_chat_streams, list(zip(names, cursors)), progress, stats, get_parse_pool(size)
+        )
+    record_parse_stats(stats)
+    return parsed_leads, [cursor.result() for cursor in cursors]
+
+def month_key(dt: datetime) -> str:
+    """Bucket key for the per-month lead counters"""
+    return dt.strftime("%Y-%m")
+
+async def increment_user_stats(user_id: str, increments: Dict[str, int]) -> None:
+    """
+    Atomically apply counter deltas to the user's user_stats document.
+    Keys are total_leads, saved_leads, total_imports or monthly_leads.<YYYY-MM>.
+    """
+    increments = {key: value for key, value in increments.items() if value}
+    if not increments:
+        return
+    await db.user_stats.update_one(
+        {"_id": user_id},
+        {"$inc": increments},
+        upsert=True
+    )
+
+async def rebuild_user_stats(user_id: str) -> Dict[str, Any]:
+    """
+    Recompute the user's counters from the leads and imports collections
+    and store them in user_stats. Used when counters are missing or drift.
+    The rebuilt counters are only stored if no counted write ran meanwhile;
+    otherwise they are returned as is and the next read rebuilds again.
+    """
+    token = stats_writes.begin_rebuild(user_id)
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        {"$facet": {
+            "totals": [
+                {"$group": {
+                    "_id": None,
+                    "total_leads": {"$sum": 1},
+                    "saved_leads": {"$sum": {"$cond": ["$is_saved", 1, 0]}}
+                }}
+            ],
+            "monthly": [
+                {"$group": {
+                    "_id": {"$dateToString": {"format": "%Y-%m", "date": "$created_at"}},
+                    "count": {"$sum": 1}
+                }}
+            ]
+        }}
+    ]
+    result = (await db.leads.aggregate(pipeline).to_list(1))[0]
+    totals = result["totals"][0] if result["totals"] else {}
+    
+    stats = {
+        "total_leads": totals.get("total_leads", 0),
+        "saved_leads": totals.get("saved_leads", 0),
+        "total_imports": await db.imports.count_documents({"user_id": user_id, "status": "completed"}),
+        "monthly_leads": {bucket["_id"]: bucket["count"] for bucket in result["monthly"] if bucket["_id"]},
+        "rebuilt_at": datetime.utcnow()
+    }
+    if not stats_writes.rebuild_is_current(user_id, token):
+        logger.info(f"Skipped storing lead stats for {user_id}, written to while rebuilding")
+        return stats
+    await db.user_stats.update_one({"_id": user_id}, {"$set": stats}, upsert=True)
+    logger.info(f"Rebuilt lead stats for {user_id}")
+    return stats
+
+def user_stats_need_rebuild(stats: Optional[Dict[str, Any]]) -> bool:
+    """Check whether stored counters are missing, stale or inconsistent"""
+    if not stats or "rebuilt_at" not in stats:
+        return True
+    if datetime.utcnow() - stats["rebuilt_at"] > STATS_REBUILD_INTERVAL:
+        return True
+    total = stats.get("total_leads", 0)
+    saved = stats.get("saved_leads", 0)
+    return total < 0 or saved < 0 or saved > total or stats.get("total_imports", 0) < 0
+
+async def upsert_parsed_leads(
+    user_id: str,
+    parsed_leads: List[LeadRecord],
+    source_chat: str,
+    import_id: str,
+    batch_size: int = IMPORT_WRITE_BATCH_SIZE,
+    on_written: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Write parsed leads as batched upserts keyed on (user_id, phone_number).
+    New leads are inserted, existing leads only get last_seen refreshed;
+    either way import_id is added to the lead's import_ids and the lead
+    gets a new change_seq.
+    on_written, if given, is called with the size of each written batch.
+
+    Returns:
+        Number of leads that were newly created
+    """
+    now = datetime.utcnow()
+    created = 0
+    
+    for start in range(0, len(parsed_leads), batch_size):
+        batch = parsed_leads[start:start + batch_size]
+        async with lead_changes.reserve(user_id, len(batch)) as first_seq:
+            created += await write_lead_batch(user_id, batch, source_chat, import_id, now, first_seq)
         
-        # Store import record
-        await db.imports.insert_one(import_record.dict())
-        
-        # Store leads
-        leads_to_store = []
-        for parsed_lead in parsed_leads:
-            # Check if lead already exists
-            existing = await db.leads.find_one({
-                "user_id": "demo_user",
-                "phone_number": parsed_lead.phone_number
-            })
+        if on_written:
+            on_written(len(batch))
+    
+    return created
+
+async def write_lead_batch(
+    user_id: str,
+    batch: List[LeadRecord],
+    source_chat: str,
+    import_id: str,
+    now: datetime,
+    first_seq: int
+) -> int:
+    """Upsert one batch of parsed leads, stamped from first_seq; returns how many were created"""
+    created = 0
+    operations = []
+    for seq, (phone_number, display_name, first_seen) in enumerate(batch, first_seq):
+        # The fields of models.Lead, built directly instead of through a model per lead
+        new_doc = {
+            "user_id": user_id,
+            "phone_number": phone_number,
+            "display_name": display_name,
+            "source_chat": source_chat,
+            "first_seen": first_seen or now,
+            "import_id": import_id,
+            "is_saved": False,
+            "tags": [],
+            "notes": None,
+            SEARCH_KEYS_FIELD: build_search_keys(phone_number, display_name),
+            "created_at": now
+        }
+        operations.append(UpdateOne(
+            {"user_id": user_id, "phone_number": phone_number},
+            {
+                "$setOnInsert": new_doc,
+                "$set": {"last_seen": now, "change_seq": seq},
+                "$addToSet": {"import_ids": import_id}
+            },
+            upsert=True
+        ))
+    
+    try:
+        result = await db.leads.bulk_write(operations, ordered=False)
+        created += result.upserted_count
+    except BulkWriteError as e:
+        # A concurrent import can insert the same number between our match
+        # and insert; retry those upserts, they now match the existing lead
+        created += e.details.get("nUpserted", 0)
+        retry = [operations[err["index"]] for err in e.details.get("writeErrors", []) if err.get("code") == 11000]
+        if len(retry) != len(e.details.get("writeErrors", [])):
+            raise
+        if retry:
+            result = await db.leads.bulk_write(retry, ordered=False)
+            created += result.upserted_count
+    
+    return created
+
+async def delete_leads(user_id: str, query: Dict[str, Any]) -> int:
+    """
+    Delete the user's leads matching query with one delete_many, leaving a
+    tombstone for each and taking them off the stats counters.
+    Leads written while this runs are left alone.
+
+    Returns:
+        Number of leads deleted
+    """
+    # Only leads whose last write is already visible are deleted; a lead
+    # written after this point gets a higher change_seq and is skipped
+    settled = {"$and": [query, {"change_seq": {"$not": {"$gt": await lead_changes.stable(user_id)}}}]}
+    matched = await db.leads.find(
+        settled, {"phone_number": 1, "is_saved": 1, "created_at": 1}
+    ).batch_size(IMPORT_WRITE_BATCH_SIZE).to_list(None)
+    if not matched:
+        return 0
+    
+    async with stats_writes.writing(user_id):
+        async with lead_changes.reserve(user_id, len(matched)) as first_seq:
+            result = await db.leads.delete_many(settled)
+            if result.deleted_count < len(matched):
+                # Some were written to (or deleted) since they were read
+                remaining = {
+                    lead["_id"] async for lead in db.leads.find(
+                        {"_id": {"$in": [lead["_id"] for lead in matched]}}, {"_id": 1}
+                    )
+                }
+                gone = set(await db.lead_tombstones.distinct(
+                    "lead_id", {"user_id": user_id, "lead_id": {"$in": [str(lead["_id"]) for lead in matched]}}
+                ))
+                matched = [lead for lead in matched if lead["_id"] not in remaining and str(lead["_id"]) not in gone]
             
-            if existing:
-                # Update last_seen
-                await db.leads.update_one(
-                    {"_id": existing["_id"]},
-                    {"$set": {"last_seen": datetime.utcnow()}}
-                )
+            now = datetime.utcnow()
+            tombstones = [
+                LeadTombstone(
+                    user_id=user_id, lead_id=str(lead["_id"]), phone_number=lead["phone_number"],
+                    change_seq=seq, deleted_at=now
+                ).dict()
+                for seq, lead in enumerate(matched, first_seq)
+            ]
+            for start in range(0, len(tombstones), IMPORT_WRITE_BATCH_SIZE):
+                await db.lead_tombstones.insert_many(tombstones[start:start + IMPORT_WRITE_BATCH_SIZE], ordered=False)
+        
+        increments = {"total_leads": -len(matched), "saved_leads": -sum(1 for lead in matched if lead.get("is_saved"))}
+        for lead in matched:
+            if lead.get("created_at"):
+                key = f"monthly_leads.{month_key(lead['created_at'])}"
+                increments[key] = increments.get(key, 0) - 1
+        await increment_user_stats(user_id, increments)
+    return len(matched)
+
+async def start_import(filename: str) -> ImportJob:
+    """
+    Reserve an import from the user's monthly quota, then create the import
+    record, in processing state, and its progress tracker. run_import gives
+    the reservation back if the import fails.
+    """
+    await reserve_quota("demo_user", "imports")
+    import_id = str(uuid.uuid4())
+    import_record = Import(
+        import_id=import_id,
+        user_id="demo_user",  # MVP: hardcoded, will be from JWT in Phase 2
+        filename=filename,
+        status="processing"
+    )
+    try:
+        await db.imports.insert_one(import_record.dict())
+    except Exception:
+        await quotas.release("demo_user", "imports")
+        raise
+    # The stats report quota usage
+    read_cache.bump("demo_user")
+    return ImportJob(import_id, filename)
+
+async def reserve_quota(user_id: str, resource: str, amount: int = 1) -> None:
+    """Reserve monthly quota, answering 403 when the user's plan has none left"""
+    try:
+        await quotas.reserve(user_id, resource, amount)
+    except QuotaExceeded as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+def check_response_mode(response_mode: str) -> None:
+    if response_mode not in RESPONSE_MODES:
+        raise HTTPException(status_code=400, detail="response_mode must be full or summary")
+
+async def run_import(
+    job: ImportJob, source: Union[str, BinaryIO], response_mode: str = "full"
+) -> Union[ImportParseResponse, ImportSummaryResponse]:
+    """
+    Parse an import from decoded content or a binary file (a chat export or
+    a zip archive of one), upsert its leads and complete its record.
+    Progress is reported on job as it goes.
+    In summary mode the result only has counts; the leads can be paged
+    through /api/imports/{import_id}/leads.
+    Content identical to a completed import is not parsed again, and chats
+    imported before are only parsed from where the last import stopped.
+    """
+    try:
+        digest = await asyncio.to_thread(content_hash, source)
+        # Only imports that parsed the content count; once that one is rolled
+        # back, the duplicates recorded against it no longer match
+        previous = await db.imports.find_one(
+            {"user_id": "demo_user", "content_hash": digest, "status": "completed", "duplicate_of": None},
+            {"import_id": 1, "lines_processed": 1, "lines_skipped": 1}
+        )
+        if previous is not None:
+            # Nothing new to parse or write
+            job.lines_skipped = previous.get("lines_processed", 0) + previous.get("lines_skipped", 0)
+            parsed_leads: List[LeadRecord] = []
+            created_count = 0
+            await db.imports.update_one({"import_id": job.import_id}, {"$set": {
+                "lines_skipped": job.lines_skipped,
+                "duplicate_of": previous["import_id"]
+            }})
+        else:
+            if isinstance(source, str):
+                parsed_leads, chats = await parse_chat_content(source, job.filename, job.on_parse_progress)
+            elif is_zip_archive(source):
+                parsed_leads, chats = await parse_chat_archive(source, job.filename, job.on_parse_progress)
             else:
-                # Create new lead
-                lead = Lead(
-                    user_id="demo_user",
-                    phone_number=parsed_lead.phone_number,
-                    display_name=parsed_lead.display_name,
-                    source_chat=request.filename,
-                    first_seen=parsed_lead.first_seen or datetime.utcnow(),
-                    last_seen=datetime.utcnow(),
-                    import_id=import_id,
-                    is_saved=False,
-                    tags=[],
-                    notes=None
+                parsed_leads, chats = await parse_chat_upload(source, job.filename, job.on_parse_progress)
+            job.lines_skipped = sum(chat.lines_skipped for chat in chats)
+            
+            await db.imports.update_one({"import_id": job.import_id}, {"$set": {
+                "lines_processed": job.lines_processed,
+                "lines_skipped": job.lines_skipped,
+                "total_numbers": len(parsed_leads),
+                "unsaved_count": len(parsed_leads)  # Will be updated after contact checking
+            }})
+        
+        async with stats_writes.writing("demo_user"):
+            if previous is None:
+                # Store leads
+                created_count = await upsert_parsed_leads(
+                    "demo_user", parsed_leads, job.filename, job.import_id, on_written=job.on_leads_written
                 )
-                leads_to_store.append(lead.dict())
+                await save_watermarks("demo_user", chats, job.import_id)
+            
+            await db.imports.update_one({"import_id": job.import_id}, {"$set": {
+                "leads_written": job.leads_written,
+                "content_hash": digest,
+                "processed_at": datetime.utcnow(),
+                "status": "completed"
+            }})
+            await increment_user_stats("demo_user", {
+                "total_imports": 1,
+                "total_leads": created_count,
+                f"monthly_leads.{month_key(datetime.utcnow())}": created_count
+            })
         
-        if leads_to_store:
-            await db.leads.insert_many(leads_to_store)
+        logger.info(f"Parsed {len(parsed_leads)} leads from {job.filename} ({job.lines_skipped} lines skipped)")
         
-        logger.info(f"Parsed {len(parsed_leads)} leads from {request.filename}")
+        if response_mode == "summary":
+            result = ImportSummaryResponse(
+                import_id=job.import_id,
+                total_count=len(parsed_leads),
+                duplicates_removed=len(parsed_leads) - created_count
+            )
+        else:
+            result = ImportParseResponse(
+                import_id=job.import_id,
+                leads=[ParsedLead(**record._asdict()) for record in parsed_leads],
+                total_count=len(parsed_leads),
+                duplicates_removed=len(parsed_leads) - created_count
+            )
+        job.finish(result)
+        return result
         
-        return ImportParseResponse(
-            import_id=import_id,
-            leads=parsed_leads,
-            total_count=len(parsed_leads),
-            duplicates_removed=len(parsed_leads) - len(leads_to_store)
+    except Exception as e:
+        job.fail(str(e))
+        await db.imports.update_one(
+            {"import_id": job.import_id},
+            {"$set": {"status": "failed", "error_message": str(e), "processed_at": datetime.utcnow()}}
+        )
+        await quotas.release("demo_user", "imports")
+        raise
+    finally:
+        read_cache.bump("demo_user")
+        if not isinstance(source, str):
+            source.close()
+
+def import_response(result: Union[ImportParseResponse, ImportSummaryResponse]) -> FastJSONResponse:
+    """
+    Encode an import result as is: its leads were validated when it was
+    built, so the endpoint's response_model does not check them again.
+    """
+    return FastJSONResponse(result.dict())
+
+async def enqueue_import(job: ImportJob, source: Union[str, BinaryIO], response_mode: str = "full") -> ImportJobResponse:
+    """Hand an import to the background workers and return its id"""
+    try:
+        import_jobs.submit(job, lambda: run_import(job, source, response_mode))
+    except asyncio.QueueFull:
+        message = "Too many imports in progress, try again shortly"
+        job.fail(message)
+        await db.imports.update_one(
+            {"import_id": job.import_id},
+            {"$set": {"status": "failed", "error_message": message}}
         )
+        await quotas.release("demo_user", "imports")
+        read_cache.bump("demo_user")
+        if not isinstance(source, str):
+            source.close()
+        raise HTTPException(status_code=503, detail=message)
+    return ImportJobResponse(import_id=job.import_id, status=job.status)
+
+# ==================== IMPORT ENDPOINTS ====================
+
+@api_router.post(
+    "/import/parse", response_model=Union[ImportParseResponse, ImportSummaryResponse, ImportJobResponse]
+)
+async def parse_import(request: ImportUploadRequest):
+    """
+    Parse uploaded WhatsApp chat file and extract phone numbers.
+    With background=true the import is queued and only its import_id is
+    returned; poll /api/imports/{import_id} for progress and results.
+    With response_mode=summary the result has counts but no leads.
+    content may also be a zip archive of an export with media.
+    For MVP, user_id is hardcoded. Will be replaced with JWT auth in Phase 2.
+    """
+    check_response_mode(request.response_mode)
+    try:
+        # Decode base64 content; archives are parsed from the raw bytes
+        raw = base64.b64decode(request.content)
+        content = io.BytesIO(raw) if raw.startswith(ZIP_MAGIC) else raw.decode('utf-8')
+        if not isinstance(content, str):
+            check_chat_archive(content, request.filename)
+        
+        job = await start_import(request.filename)
+        if request.background:
+            return await enqueue_import(job, content, request.response_mode)
+        return import_response(await run_import(job, content, request.response_mode))
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error parsing import: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error parsing file: {str(e)}")
 
+@api_router.post(
+    "/import/upload", response_model=Union[ImportParseResponse, ImportSummaryResponse, ImportJobResponse]
+)
+async def upload_import(
+    file: UploadFile = File(...), background: bool = Form(False), response_mode: str = Form("full")
+):
+    """
+    Parse a WhatsApp chat file sent as multipart/form-data.
+    The upload is read in blocks and decoded line by line, so the file is
+    never held in memory as a single string. A zip archive (an export with
+    media) is parsed from its chat text members only, several chats at once
+    into one import. With background=true the upload is copied to a
+    temporary file and queued like /import/parse.
+    """
+    try:
+        check_response_mode(response_mode)
+        filename = file.filename or "chat.txt"
+        check_chat_archive(file.file, filename)
+        job = await start_import(filename)
+        if not background:
+            return import_response(await run_import(job, file.file, response_mode))
+        
+        # The upload is discarded when this request ends, so keep our own copy
+        spool = tempfile.TemporaryFile()
+        await asyncio.to_thread(shutil.copyfileobj, file.file, spool)
+        spool.seek(0)
+        return await enqueue_import(job, spool, response_mode)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error parsing upload: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error parsing file: {str(e)}")
+    finally:
+        await file.close()
+
+@api_router.get("/imports/{import_id}", response_model=ImportStatusResponse)
+async def get_import_status(import_id: str):
+    """
+    Get an import's status and progress. Once a background import has
+    completed, its parse result is included while it is retained.
+    """
+    try:
+        record = await db.imports.find_one({"import_id": import_id, "user_id": "demo_user"})
+    except Exception as e:
+        logger.error(f"Error fetching import: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if record is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    
+    status = ImportStatusResponse(
+        import_id=import_id,
+        filename=record["filename"],
+        status=record.get("status", "completed"),
+        lines_processed=record.get("lines_processed", 0),
+        lines_skipped=record.get("lines_skipped", 0),
+        numbers_found=record.get("total_numbers", 0),
+        leads_written=record.get("leads_written", 0),
+        error_message=record.get("error_message")
+    )
+    
+    # Live progress is only known to the process running the job
+    job = import_jobs.get(import_id)
+    if job is not None and record.get("status") != "rolled_back":
+        status.status = job.status
+        status.lines_processed = job.lines_processed
+        status.lines_skipped = job.lines_skipped
+        status.numbers_found = job.numbers_found
+        status.leads_written = job.leads_written
+        status.error_message = job.error_message
+        status.result = job.result
+    
+    return status
+
+@api_router.get("/imports/{import_id}/leads")
+async def get_import_leads(
+    import_id: str, after: Optional[str] = None, limit: int = 100, fields: Optional[str] = None
+):
+    """
+    Page through every lead an import found, including numbers that were
+    already stored. Pass the returned next_after as after for the next page.
+    fields narrows each lead to a comma-separated list of fields.
+    """
+    try:
+        after_id = ObjectId(after) if after else None
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid after token")
+    projection = lead_projection(fields)
+    
+    try:
+        user_id = "demo_user"
+        if await db.imports.count_documents({"import_id": import_id, "user_id": user_id}, limit=1) == 0:
+            raise HTTPException(status_code=404, detail="Import not found")
+        
+        query: Dict[str, Any] = {"user_id": user_id, "import_ids": import_id}
+        if after_id:
+            query["_id"] = {"$gt": after_id}
+        
+        leads = await db.leads.find(query, projection).sort("_id", 1).limit(limit).to_list(limit)
+        next_after = str(leads[-1]["_id"]) if limit and len(leads) == limit else None
+        
+        return FastJSONResponse({
+            "leads": leads,
+            "limit": limit,
+            "next_after": next_after
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching import leads: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.delete("/imports/{import_id}")
+async def rollback_import(import_id: str):
+    """
+    Roll back an import: delete the leads no other import also found, drop
+    it from the import_ids of the rest (handing import_id on to one of the
+    imports left where it pointed at this one), and forget the
+    chat watermarks saved from it on, so the chats are parsed in full if
+    imported again. The import record is kept, marked rolled_back.
+    """
+    try:
+        user_id = "demo_user"
+        record = await db.imports.find_one({"import_id": import_id, "user_id": user_id})
+        if record is None:
+            raise HTTPException(status_code=404, detail="Import not found")
+        if record.get("status") == "processing":
+            raise HTTPException(status_code=409, detail="Import is still processing")
+        if record.get("status") == "rolled_back":
+            return {"success": True, "deleted_count": 0}
+        
+        async with stats_writes.writing(user_id):
+            # Leads only this import found, whichever import created them,
+            # selected through the user_import_ids index
+            deleted_count = await delete_leads(user_id, {"user_id": user_id, "import_ids": [import_id]})
+            without_import = {"$set": {"import_ids": {
+                "$filter": {"input": "$import_ids", "cond": {"$ne": ["$$this", import_id]}}
+            }}}
+            # Leads kept whose import_id pointed at this import take the next
+            # one; import_id is synced, so each gets a new change_seq
+            handed_on = await db.leads.find(
+                {"user_id": user_id, "import_id": import_id}, {"_id": 1}
+            ).batch_size(IMPORT_WRITE_BATCH_SIZE).to_list(None)
+            for start in range(0, len(handed_on), IMPORT_WRITE_BATCH_SIZE):
+                batch = handed_on[start:start + IMPORT_WRITE_BATCH_SIZE]
+                async with lead_changes.reserve(user_id, len(batch)) as first_seq:
+                    await db.leads.bulk_write([
+                        UpdateOne({"_id": lead["_id"], "import_id": import_id}, [
+                            without_import,
+                            {"$set": {"import_id": {"$first": "$import_ids"}, "change_seq": seq}}
+                        ])
+                        for seq, lead in enumerate(batch, first_seq)
+                    ], ordered=False)
+            # import_ids is left out of synced leads, so the rest only drop it
+            await db.leads.update_many({"user_id": user_id, "import_ids": import_id}, [without_import])
+            # Later imports of the same chats resumed from this import's watermarks
+            await db.chat_watermarks.delete_many({"user_id": user_id, "$or": [
+                {"import_id": import_id},
+                {"updated_at": {"$gt": record.get("processed_at", datetime.min)}}
+            ]})
+            
+            await db.imports.update_one({"import_id": import_id}, {"$set": {
+                "status": "rolled_back",
+                "rolled_back_at": datetime.utcnow()
+            }})
+            if record.get("status") == "completed":
+                await increment_user_stats(user_id, {"total_imports": -1})
+        read_cache.bump(user_id)
+        
+        logger.info(f"Rolled back import {import_id}, deleting {deleted_count} leads")
+        return {"success": True, "deleted_count": deleted_count}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error rolling back import: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ==================== LEAD ENDPOINTS ====================
 
 @api_router.get("/leads")
 async def get_leads(
+    request: Request,
     is_saved: Optional[bool] = None,
     search: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after: Optional[str] = None,
+    count: str = "exact",
+    fields: Optional[str] = None
 ):
-    """Get leads with optional filtering"""
+    """
+    Get leads with optional filtering, newest last_seen first.
+    Pass the returned next_after as after to fetch the following page without
+    skipping over earlier ones. count is "exact", "estimated" (from the stats
+    counters, not available with search) or "none". fields narrows each
+    lead to a comma-separated list of fields (last_seen is always included,
+    it is part of the page token). Responses carry an ETag and are cached
+    until the user's leads change.
+    """
+    if count not in ("exact", "estimated", "none"):
+        raise HTTPException(status_code=400, detail="count must be exact, estimated or none")
+    projection = lead_projection(fields, required=("last_seen",))
+    
     try:
-        query: Dict[str, Any] = {"user_id": "demo_user"}
+        after_key = decode_page_token(after) if after else None
+    except (ValueError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid after token")
+    search_filter = search_query(search)
+    
+    user_id = "demo_user"
+    
+    async def load() -> Dict[str, Any]:
+        query: Dict[str, Any] = {"user_id": user_id}
         
         if is_saved is not None:
             query["is_saved"] = is_saved
+        else:
+            # Lets the (user_id, is_saved, last_seen, _id) index serve the sort
+            # by merging its two is_saved ranges
+            query["is_saved"] = {"$in": [False, True]}
         
-        if search:
-            query["$or"] = [
-                {"phone_number": {"$regex": search, "$options": "i"}},
-                {"display_name": {"$regex": search, "$options": "i"}}
-            ]
+        query.update(search_filter)
+        
+        page_query = query
+        if after_key:
+            last_seen, lead_id = after_key
+            page_query = {"$and": [query, {"$or": [
+                {"last_seen": {"$lt": last_seen}},
+                {"last_seen": last_seen, "_id": {"$lt": lead_id}}
+            ]}]}
         
-        leads = await db.leads.find(query).sort("last_seen", -1).skip(skip).limit(limit).to_list(limit)
-        total = await db.leads.count_documents(query)
+        leads = await db.leads.find(page_query, projection).sort(
+            [("last_seen", -1), ("_id", -1)]
+        ).skip(skip).limit(limit).to_list(limit)
+        next_after = encode_page_token(leads[-1]) if limit and len(leads) == limit else None
+        
+        total: Optional[int] = None
+        if count == "exact":
+            total = await db.leads.count_documents(query)
+        elif count == "estimated" and not search:
+            stats = await db.user_stats.find_one({"_id": user_id}) or {}
+            total = stats.get("total_leads", 0)
+            if is_saved is True:
+                total = stats.get("saved_leads", 0)
+            elif is_saved is False:
+                total -= stats.get("saved_leads", 0)
         
         return {
-            "leads": [serialize_doc(lead) for lead in leads],
+            "leads": leads,
             "total": total,
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_after": next_after
         }
-        
+    
+    try:
+        return await cached_read(
+            request, user_id, ("leads", is_saved, search, skip, limit, after, count, fields), load
+        )
     except Exception as e:
         logger.error(f"Error fetching leads: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.post("/leads/query")
+async def query_leads(
+    request: Request,
+    lead_filter: LeadFilterRequest,
+    limit: int = 100,
+    after: Optional[str] = None,
+    count: str = "none",
+    fields: Optional[str] = None
+):
+    """
+    Leads matching a LeadFilterRequest, most recently first seen first.
+    Pass the returned next_after as after for the next page. count is
+    "exact" or "none"; fields narrows each lead as for /leads.
+    """
+    if count not in ("exact", "none"):
+        raise HTTPException(status_code=400, detail="count must be exact or none")
+    projection = lead_projection(fields, required=("first_seen",))
+    
+    try:
+        after_key = decode_page_token(after) if after else None
+    except (ValueError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid after token")
+    
+    user_id = "demo_user"
+    query = lead_filter_query(user_id, lead_filter)
+    
+    async def load() -> Dict[str, Any]:
+        page_query = query_after(query, *after_key) if after_key else query
+        
+        leads = await db.leads.find(page_query, projection).sort(FILTER_SORT).limit(limit).to_list(limit)
+        next_after = encode_page_token(leads[-1], "first_seen") if limit and len(leads) == limit else None
+        total = await db.leads.count_documents(query) if count == "exact" else None
+        
+        return {
+            "leads": leads,
+            "total": total,
+            "limit": limit,
+            "next_after": next_after
+        }
+    
+    try:
+        return await cached_read(
+            request, user_id, ("query", lead_filter.json(), limit, after, count, fields), load
+        )
+    except Exception as e:
+        logger.error(f"Error querying leads: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/leads/changes")
+async def get_lead_changes(since: Optional[str] = None, limit: int = 500, fields: Optional[str] = None):
+    """
+    Leads written and _ids of leads deleted since a sync token, oldest
+    change first. Without since every lead is returned. Pass next_token as
+    since for the next batch while has_more is true, and on the next sync.
+    A 410 means the token is older than the kept tombstones and the client
+    must start over without since. fields narrows each lead as for /leads.
+    """
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    projection = lead_projection(fields, required=("change_seq",))
+    
+    since_seq = 0
+    if since:
+        try:
+            since_seq, issued_at = decode_change_token(since)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid sync token")
+        if datetime.utcnow() - issued_at > LEAD_TOMBSTONE_TTL:
+            raise HTTPException(status_code=410, detail="Sync token expired, sync all leads again")
+    
+    try:
+        user_id = "demo_user"
+        # Changes past this point may still be being written
+        upto = await lead_changes.stable(user_id)
+        changed = {"user_id": user_id, "change_seq": {"$gt": since_seq, "$lte": upto}}
+        
+        leads = await db.leads.find(changed, projection).sort("change_seq", 1).limit(limit).to_list(limit)
+        # A first sync has nothing to delete
+        deleted = []
+        if since_seq:
+            deleted = await db.lead_tombstones.find(
+                changed, {"_id": 0, "lead_id": 1, "change_seq": 1}
+            ).sort("change_seq", 1).limit(limit).to_list(limit)
+        
+        # Merge both by change_seq, up to limit changes in all
+        changes = sorted(leads + deleted, key=lambda change: change["change_seq"])
+        has_more = len(changes) > limit or len(leads) == limit or len(deleted) == limit
+        changes = changes[:limit]
+        next_seq = changes[-1]["change_seq"] if has_more else upto
+        
+        return FastJSONResponse({
+            "leads": [change for change in changes if "lead_id" not in change],
+            "deleted": [change["lead_id"] for change in changes if "lead_id" in change],
+            "next_token": encode_change_token(next_seq),
+            "has_more": has_more
+        })
+        
+    except Exception as e:
+        logger.error(f"Error fetching lead changes: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.post("/leads/bulk-save")
 async def bulk_save_leads(request: BulkSaveRequest):
-    """Mark leads as saved (actual contact saving happens on device)"""
+    """
+    Mark leads as saved and name them from the user's naming config, with
+    request.naming_config overriding it. Numbers for auto-numbered names
+    come from one reserved block and all names are written in one bulk
+    write. The contacts themselves are saved on device under the returned
+    names; leads saved earlier keep their name.
+    """
     try:
-        # Convert string IDs to ObjectId
-        lead_ids = [ObjectId(lid) for lid in request.lead_ids]
+        user = await db.users.find_one({"_id": "demo_user"}, {"naming_config": 1}) or {}
+        try:
+            config = NamingConfig(**{**user.get("naming_config", {}), **(request.naming_config or {})})
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid naming_config: {e}")
         
-        # Update leads
-        result = await db.leads.update_many(
-            {"_id": {"$in": lead_ids}},
-            {"$set": {"is_saved": True}}
-        )
+        # Keep the request order
+        lead_ids = list(dict.fromkeys(parse_lead_ids(request.lead_ids)))
+        found = {
+            lead["_id"]: lead
+            async for lead in db.leads.find(
+                {"_id": {"$in": lead_ids}, "user_id": "demo_user"},
+                {"phone_number": 1, "display_name": 1, "is_saved": 1, "saved_name": 1}
+            )
+        }
+        leads = [found[lead_id] for lead_id in lead_ids if lead_id in found]
+        unsaved = [lead for lead in leads if not lead.get("is_saved")]
+        await reserve_quota("demo_user", "contacts", len(unsaved))
         
-        logger.info(f"Marked {result.modified_count} leads as saved")
+        async with stats_writes.writing("demo_user"):
+            try:
+                first_number = None
+                if config.auto_numbering and unsaved:
+                    first_number = config.number_start + await reserve_contact_numbers("demo_user", len(unsaved)) - 1
+                
+                updated_count = 0
+                if unsaved:
+                    async with lead_changes.reserve("demo_user", len(unsaved)) as first_seq:
+                        operations = []
+                        for i, lead in enumerate(unsaved):
+                            lead["saved_name"] = build_contact_name(
+                                config, lead, None if first_number is None else first_number + i
+                            )
+                            operations.append(UpdateOne(
+                                {"_id": lead["_id"], "is_saved": False},
+                                {"$set": {"is_saved": True, "saved_name": lead["saved_name"], "change_seq": first_seq + i}}
+                            ))
+                        result = await db.leads.bulk_write(operations, ordered=False)
+                        updated_count = result.modified_count
+            except Exception:
+                # Some of the writes may have gone through
+                await quotas.release("demo_user", "contacts", len(unsaved))
+                read_cache.bump("demo_user")
+                raise
+            
+            if updated_count < len(unsaved):
+                # A concurrent bulk-save named some of these leads first: return
+                # their quota and report the names it gave them
+                await quotas.release("demo_user", "contacts", len(unsaved) - updated_count)
+                current = {
+                    lead["_id"]: lead.get("saved_name")
+                    async for lead in db.leads.find(
+                        {"_id": {"$in": [lead["_id"] for lead in unsaved]}}, {"saved_name": 1}
+                    )
+                }
+                for lead in unsaved:
+                    lead["saved_name"] = current.get(lead["_id"], lead["saved_name"])
+            
+            await increment_user_stats("demo_user", {"saved_leads": updated_count})
+        read_cache.bump("demo_user")
+        
+        logger.info(f"Marked {updated_count} leads as saved")
         
         return {
             "success": True,
-            "updated_count": result.modified_count
+            "updated_count": updated_count,
+            "leads": [
+                {"_id": str(lead["_id"]), "phone_number": lead["phone_number"], "saved_name": lead.get("saved_name")}
+                for lead in leads
+            ]
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error saving leads: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.post("/leads/bulk-delete")
+async def bulk_delete_leads(request: BulkDeleteRequest):
+    """
+    Delete explicit lead_ids, or every lead matching filter, in one
+    delete_many. One of them is required, so an empty request cannot
+    delete everything.
+    """
+    user_id = "demo_user"
+    if request.lead_ids is not None:
+        query = {"user_id": user_id, "_id": {"$in": parse_lead_ids(request.lead_ids)}}
+    elif request.filter is not None:
+        query = lead_filter_query(user_id, request.filter)
+    else:
+        raise HTTPException(status_code=400, detail="lead_ids or filter is required")
+    
+    try:
+        deleted_count = await delete_leads(user_id, query)
+        read_cache.bump(user_id)
+        logger.info(f"Deleted {deleted_count} leads")
+        return {"success": True, "deleted_count": deleted_count}
+    except Exception as e:
+        logger.error(f"Error deleting leads: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.post("/leads/export-vcf")
 async def export_vcf(request: ExportVCFRequest):
     """Generate VCF content for selected leads"""
@@ -197,16 +1424,7 @@ async def export_vcf(request: ExportVCFRequest):
         leads = await db.leads.find({"_id": {"$in": lead_ids}}).to_list(len(lead_ids))
         
         # Generate VCF content
-        vcf_content = ""
-        for lead in leads:
-            display_name = lead.get("display_name") or lead.get("phone_number")
-            phone = lead.get("phone_number")
-            
-            vcf_content += "BEGIN:VCARD\n"
-            vcf_content += "VERSION:3.0\n"
-            vcf_content += f"FN:{display_name}\n"
-            vcf_content += f"TEL;TYPE=CELL:{phone}\n"
-            vcf_content += "END:VCARD\n"
+        vcf_content = "".join(format_vcard(lead) for lead in leads)
         
         # Encode to base64 for easy transfer
         vcf_base64 = base64.b64encode(vcf_content.encode()).decode()
@@ -221,49 +1439,120 @@ async def export_vcf(request: ExportVCFRequest):
         logger.error(f"Error exporting VCF: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def export_query(request: ExportStreamRequest) -> Dict[str, Any]:
+    """
+    Leads query for an export of explicit lead_ids or of every lead matching
+    filter; malformed ids and too short phone searches are rejected with a 400.
+    """
+    if request.lead_ids is not None:
+        return {
+            "user_id": "demo_user",
+            "_id": {"$in": parse_lead_ids(request.lead_ids)}
+        }
+    return lead_filter_query("demo_user", request.filter)
+
+def export_response(chunks: AsyncIterator[bytes], media_type: str, filename: str, compress: bool) -> StreamingResponse:
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+@api_router.post("/leads/export-vcf/stream")
+async def export_vcf_stream(request: ExportStreamRequest):
+    """
+    Stream a VCF file for explicit lead_ids or for every lead matching filter.
+    Leads are read from a cursor in batches, so memory stays flat however many are exported.
+    """
+    query = export_query(request)
+    return export_response(iter_vcards(query, compress=request.gzip), "text/vcard", "contacts.vcf", request.gzip)
+
+@api_router.post("/leads/export-csv/stream")
+async def export_csv_stream(request: ExportStreamRequest):
+    """
+    Stream the leads selected as for the VCF export as CSV with a header
+    row; tags are joined with semicolons.
+    """
+    header = ",".join(EXPORT_FIELDS).encode() + b"\r\n"
+    chunks = iter_export(export_query(request), EXPORT_FIELDS, render_csv, header=header, compress=request.gzip)
+    return export_response(chunks, "text/csv", "leads.csv", request.gzip)
+
+@api_router.post("/leads/export-ndjson/stream")
+async def export_ndjson_stream(request: ExportStreamRequest):
+    """Stream the leads selected as for the VCF export as one JSON object per line"""
+    chunks = iter_export(export_query(request), EXPORT_FIELDS, render_ndjson, compress=request.gzip)
+    return export_response(chunks, "application/x-ndjson", "leads.ndjson", request.gzip)
+
 @api_router.get("/leads/stats", response_model=LeadStatsResponse)
-async def get_stats():
-    """Get lead statistics"""
-    try:
-        user_id = "demo_user"
+async def get_stats(request: Request, refresh: bool = False):
+    """
+    Get lead statistics from the user's counters document.
+    Counters are rebuilt from the collections when missing, stale,
+    inconsistent, or when refresh is requested. Responses carry an ETag
+    and are cached until the user's data changes or the month turns.
+    """
+    user_id = "demo_user"
+    this_month = month_key(datetime.utcnow())
+    
+    async def load() -> Dict[str, Any]:
+        stats = await db.user_stats.find_one({"_id": user_id})
+        if refresh or user_stats_need_rebuild(stats):
+            stats = await rebuild_user_stats(user_id)
         
-        total_leads = await db.leads.count_documents({"user_id": user_id})
-        unsaved_leads = await db.leads.count_documents({"user_id": user_id, "is_saved": False})
-        saved_leads = await db.leads.count_documents({"user_id": user_id, "is_saved": True})
-        total_imports = await db.imports.count_documents({"user_id": user_id})
+        total_leads = stats.get("total_leads", 0)
+        saved_leads = stats.get("saved_leads", 0)
+        total_imports = stats.get("total_imports", 0)
         
         # Leads this month
-        month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        leads_this_month = await db.leads.count_documents({
-            "user_id": user_id,
-            "created_at": {"$gte": month_start}
-        })
+        leads_this_month = stats.get("monthly_leads", {}).get(this_month, 0)
+        tier, limits = await quotas.plan(user_id)
+        usage = await quotas.usage(user_id)
         
         return LeadStatsResponse(
             total_leads=total_leads,
-            unsaved_leads=unsaved_leads,
+            unsaved_leads=total_leads - saved_leads,
             saved_leads=saved_leads,
             total_imports=total_imports,
             leads_this_month=leads_this_month,
             subscription_usage={
-                "imports": total_imports,
-                "contacts_saved": saved_leads,
-                "tier": "free"
+                "imports": usage["imports"],
+                "contacts_saved": usage["contacts"],
+                "imports_limit": limits.imports_per_month,
+                "contacts_limit": limits.contacts_per_month,
+                "tier": tier.value
             }
-        )
-        
+        ).dict()
+    
+    try:
+        return await cached_read(request, user_id, ("stats", this_month), load, refresh=refresh)
     except Exception as e:
         logger.error(f"Error fetching stats: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.delete("/leads/{lead_id}")
 async def delete_lead(lead_id: str):
-    """Delete a lead"""
+    """Delete a lead, leaving a tombstone for delta syncs"""
     try:
-        result = await db.leads.delete_one({"_id": ObjectId(lead_id)})
-        if result.deleted_count == 0:
-            raise HTTPException(status_code=404, detail="Lead not found")
+        user_id = "demo_user"
+        async with stats_writes.writing(user_id):
+            async with lead_changes.reserve(user_id, 1) as change_seq:
+                lead = await db.leads.find_one_and_delete(
+                    {"_id": ObjectId(lead_id), "user_id": user_id},
+                    projection={"user_id": 1, "phone_number": 1, "is_saved": 1, "created_at": 1}
+                )
+                if lead is None:
+                    raise HTTPException(status_code=404, detail="Lead not found")
+                await db.lead_tombstones.insert_one(LeadTombstone(
+                    user_id=user_id, lead_id=lead_id, phone_number=lead["phone_number"], change_seq=change_seq
+                ).dict())
+            
+            increments = {"total_leads": -1, "saved_leads": -1 if lead.get("is_saved") else 0}
+            if lead.get("created_at"):
+                increments[f"monthly_leads.{month_key(lead['created_at'])}"] = -1
+            await increment_user_stats(lead["user_id"], increments)
+        read_cache.bump(lead["user_id"])
         return {"success": True}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error deleting lead: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -296,6 +1585,11 @@ async def health_check():
             "error": str(e)
         }
 
+@api_router.get("/metrics")
+async def get_metrics():
+    """Request, MongoDB, parser and phone cache metrics in the Prometheus text format"""
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -307,6 +1601,142 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(RequestMetricsMiddleware, latency=request_latency, requests=requests_total)
+
+@app.on_event("startup")
+async def load_phone_cache():
+    if PHONE_CACHE_PATH:
+        await asyncio.to_thread(shared_phone_cache.load, PHONE_CACHE_PATH)
+
+@app.on_event("startup")
+async def start_import_workers():
+    import_jobs.start()
+
+@app.on_event("startup")
+async def create_indexes():
+    # One lead per phone number per user; backs the import upserts
+    await db.leads.create_index(
+        [("user_id", 1), ("phone_number", 1)],
+        unique=True,
+        name="user_phone_unique"
+    )
+    await db.imports.create_index("user_id")
+    await db.imports.create_index("import_id", unique=True)
+    # Short-circuiting re-uploads of identical content
+    await db.imports.create_index([("user_id", 1), ("content_hash", 1)], name="user_content_hash")
+    await db.chat_watermarks.create_index(
+        [("user_id", 1), ("fingerprint", 1)],
+        unique=True,
+        name="user_fingerprint_unique"
+    )
+    # Lead list ordering and keyset pagination
+    await db.leads.create_index(
+        [("user_id", 1), ("is_saved", 1), ("last_seen", -1), ("_id", -1)],
+        name="user_saved_last_seen"
+    )
+    await db.leads.create_index(
+        [("user_id", 1), (SEARCH_KEYS_FIELD, 1)],
+        name="user_search_keys"
+    )
+    # Paging through the leads of one import
+    await db.leads.create_index(
+        [("user_id", 1), ("import_ids", 1), ("_id", 1)],
+        name="user_import_ids"
+    )
+    # Filtered lead queries (see lead_query.py)
+    await db.leads.create_indexes(LEAD_QUERY_INDEXES)
+    # Delta syncs; tombstones expire after LEAD_TOMBSTONE_TTL
+    await db.leads.create_index([("user_id", 1), ("change_seq", 1)], name="user_change_seq")
+    await db.lead_tombstones.create_index([("user_id", 1), ("change_seq", 1)], name="user_change_seq")
+    await db.lead_tombstones.create_index(
+        "deleted_at", expireAfterSeconds=int(LEAD_TOMBSTONE_TTL.total_seconds()), name="deleted_at_ttl"
+    )
+    asyncio.create_task(backfill_search_keys())
+    asyncio.create_task(backfill_import_ids())
+    asyncio.create_task(backfill_change_seqs())
+
+async def backfill_import_ids():
+    """Seed import_ids from import_id on leads stored before it was maintained"""
+    try:
+        result = await db.leads.update_many(
+            {"import_ids": {"$exists": False}},
+            [{"$set": {"import_ids": ["$import_id"]}}]
+        )
+        if result.modified_count:
+            logger.info(f"Backfilled import ids for {result.modified_count} leads")
+    except Exception as e:
+        logger.error(f"Error backfilling import ids: {str(e)}")
+
+async def backfill_change_seqs():
+    """Stamp leads stored before change_seq was maintained, so delta syncs include them"""
+    try:
+        backfilled = 0
+        cursor = db.leads.find({"change_seq": {"$exists": False}}, {"user_id": 1}).batch_size(IMPORT_WRITE_BATCH_SIZE)
+        
+        batch: List[Dict] = []
+        async for lead in cursor:
+            batch.append(lead)
+            if len(batch) >= IMPORT_WRITE_BATCH_SIZE:
+                backfilled += await stamp_change_seqs(batch)
+                batch = []
+        if batch:
+            backfilled += await stamp_change_seqs(batch)
+        
+        if backfilled:
+            logger.info(f"Backfilled change sequence for {backfilled} leads")
+    except Exception as e:
+        logger.error(f"Error backfilling change sequence: {str(e)}")
+
+async def stamp_change_seqs(leads: List[Dict]) -> int:
+    """Give each lead the next change_seq of its user"""
+    by_user: Dict[str, List[ObjectId]] = {}
+    for lead in leads:
+        by_user.setdefault(lead["user_id"], []).append(lead["_id"])
+    
+    for user_id, lead_ids in by_user.items():
+        async with lead_changes.reserve(user_id, len(lead_ids)) as first_seq:
+            await db.leads.bulk_write([
+                UpdateOne({"_id": lead_id, "change_seq": {"$exists": False}}, {"$set": {"change_seq": seq}})
+                for seq, lead_id in enumerate(lead_ids, first_seq)
+            ], ordered=False)
+    return len(leads)
+
+async def backfill_search_keys():
+    """Add search keys to leads stored before they were maintained on write"""
+    try:
+        backfilled = 0
+        cursor = db.leads.find(
+            {SEARCH_KEYS_FIELD: {"$exists": False}},
+            {"phone_number": 1, "display_name": 1}
+        ).batch_size(IMPORT_WRITE_BATCH_SIZE)
+        
+        operations = []
+        async for lead in cursor:
+            operations.append(UpdateOne(
+                {"_id": lead["_id"]},
+                {"$set": {SEARCH_KEYS_FIELD: build_search_keys(lead["phone_number"], lead.get("display_name"))}}
+            ))
+            if len(operations) >= IMPORT_WRITE_BATCH_SIZE:
+                await db.leads.bulk_write(operations, ordered=False)
+                backfilled += len(operations)
+                operations = []
+        if operations:
+            await db.leads.bulk_write(operations, ordered=False)
+            backfilled += len(operations)
+        
+        if backfilled:
+            logger.info(f"Backfilled search keys for {backfilled} leads")
+    except Exception as e:
+        logger.error(f"Error backfilling search keys: {str(e)}")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await import_jobs.stop()
     client.close()
+    if parse_pool is not None:
+        parse_pool.shutdown(cancel_futures=True)
+    if PHONE_CACHE_PATH:
+        try:
+            shared_phone_cache.save(PHONE_CACHE_PATH)
+        except OSError as e:
+            logger.error(f"Error saving phone cache: {str(e)}")
@@ -0,0 +1,41 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+class StatsWrites:
+    """
+    Tracks the writes that move a user's stats counters, from their first
+    write to the leads or imports collections until their counter deltas
+    are applied. A rebuild of the counters from the collections would race
+    with them, counting a write once in its totals and again when the
+    write's $inc lands, so a rebuild is only stored when no write was in
+    flight while it ran.
+
+    Writes are tracked in process, like change sequence blocks, so the API
+    must run as a single process.
+    """
+
+    def __init__(self):
+        self._active: Dict[str, int] = {}
+        self._started: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def writing(self, user_id: str) -> AsyncIterator[None]:
+        """Mark a write in flight; the counter deltas must be applied before the block exits"""
+        self._active[user_id] = self._active.get(user_id, 0) + 1
+        self._started[user_id] = self._started.get(user_id, 0) + 1
+        try:
+            yield
+        finally:
+            self._active[user_id] -= 1
+            if not self._active[user_id]:
+                del self._active[user_id]
+
+    def begin_rebuild(self, user_id: str) -> Optional[int]:
+        """Token for a rebuild starting now, or None while a write is in flight"""
+        if user_id in self._active:
+            return None
+        return self._started.get(user_id, 0)
+
+    def rebuild_is_current(self, user_id: str, token: Optional[int]) -> bool:
+        """Whether no write has run since begin_rebuild returned token"""
+        return token is not None and user_id not in self._active and self._started.get(user_id, 0) == token
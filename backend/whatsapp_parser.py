@@ -1,19 +1,236 @@
 import re
+import time
+import codecs
+import zipfile
 import phonenumbers
-from typing import List, Dict, Optional, Set, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import chain, islice, repeat
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Dict, NamedTuple, Optional, Sequence, Set, Tuple
 from datetime import datetime
-from models import ParsedLead
+from phone_cache import PhoneNormalizationCache, shared_phone_cache, MISSING
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Default size (in characters) of the line-aligned chunks used for parallel parsing
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+def split_into_chunks(content: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Split content into chunks of roughly chunk_size characters, cut on line boundaries.
+    """
+    start = 0
+    while start < len(content):
+        end = content.find('\n', start + chunk_size)
+        if end == -1:
+            yield content[start:]
+            return
+        yield content[start:end]
+        start = end + 1
+
+# Bytes read per call when decoding an uploaded file stream
+STREAM_READ_SIZE = 64 * 1024
+
+def iter_decoded_lines(stream: BinaryIO, encoding: str = 'utf-8', read_size: int = STREAM_READ_SIZE) -> Iterator[str]:
+    """
+    Read a binary stream in blocks and yield its decoded lines one at a time.
+    Lines are split on newline characters only, matching parse_chat_file.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ''
+    while True:
+        block = stream.read(read_size)
+        text = decoder.decode(block, final=not block)
+        if text:
+            lines = (pending + text).split('\n')
+            pending = lines.pop()
+            yield from lines
+        if not block:
+            break
+    if pending:
+        yield pending
+
+# Local file header signature that every zip archive starts with
+ZIP_MAGIC = b'PK\x03\x04'
+
+def is_zip_archive(stream: BinaryIO) -> bool:
+    """Check whether a seekable binary stream holds a zip archive, leaving its position unchanged"""
+    position = stream.tell()
+    magic = stream.read(len(ZIP_MAGIC))
+    stream.seek(position)
+    return magic == ZIP_MAGIC
+
+def chat_archive_members(archive: zipfile.ZipFile) -> List[str]:
+    """
+    Names of the chat text members of an exported archive, in archive order.
+    WhatsApp names them _chat.txt or "WhatsApp Chat with <name>.txt";
+    media files and the resource forks macOS adds when re-zipping are skipped.
+    """
+    names = []
+    for info in archive.infolist():
+        basename = info.filename.rsplit('/', 1)[-1]
+        if info.is_dir() or info.filename.startswith('__MACOSX/') or basename.startswith('._'):
+            continue
+        if basename.lower().endswith('.txt'):
+            names.append(info.filename)
+    return names
+
+# Progress callbacks receive (lines processed, unique numbers found so far).
+# While lines are still being read the count is of distinct phone candidates,
+# an upper bound that the final call replaces with the validated count
+ProgressCallback = Callable[[int, int], None]
+
+# Lines parsed between progress callbacks
+PROGRESS_INTERVAL = 10_000
+
+# Number of leading lines used to detect a file's message and timestamp format
+DETECT_SAMPLE_LINES = 200
+
+# Stage timers run on one line in this many, keeping their overhead small
+TIMING_SAMPLE_INTERVAL = 16
+
+# Length range of a cleaned phone candidate (digits plus an optional '+')
+MIN_PHONE_LENGTH = 10
+MAX_PHONE_LENGTH = 15
+
+# Uncached candidates validated on the executor, when one is given, once a
+# parse has at least this many; they are sent in batches of VALIDATION_BATCH_SIZE
+PARALLEL_VALIDATION_THRESHOLD = 5_000
+VALIDATION_BATCH_SIZE = 1_000
+
+# Chats read at once by parse_chat_streams
+MAX_STREAM_THREADS = 8
+
+_NON_PHONE_CHARS = re.compile(r'[^\d+]')
+
+# First occurrence of each cleaned phone candidate: (timestamp, sender name
+# if the candidate was the sender, else None), in the order first seen
+Candidates = Dict[str, Tuple[Optional[datetime], Optional[str]]]
+
+class ChatFormat(NamedTuple):
+    """Message pattern and timestamp format detected for one chat file"""
+    pattern_index: int
+    timestamp_format: Optional[str]
+
+class LeadRecord(NamedTuple):
+    """
+    A unique phone number found by the parser. Kept as a plain tuple while
+    parsing and writing; models.ParsedLead is only built for API responses.
+    """
+    phone_number: str
+    display_name: Optional[str]
+    first_seen: Optional[datetime]
+
+class ParseStats:
+    """
+    Counts and stage timings (in seconds) for one parse. Per-line timers only
+    run on sampled lines (while timing is set) and are scaled up by
+    stage_seconds; message_seconds includes timestamp_seconds. Validation
+    runs once per distinct candidate after the lines are read, and is timed
+    in full.
+    """
+    
+    def __init__(self):
+        self.timing = False
+        self.lines = 0
+        self.numbers = 0
+        self.validations = 0
+        self.message_seconds = 0.0
+        self.timestamp_seconds = 0.0
+        self.extraction_seconds = 0.0
+        self.validation_seconds = 0.0
+    
+    @property
+    def stage_seconds(self) -> Dict[str, float]:
+        """Estimated exclusive time spent in each parse stage"""
+        return {
+            "line_matching": (self.message_seconds - self.timestamp_seconds) * TIMING_SAMPLE_INTERVAL,
+            "timestamp_parsing": self.timestamp_seconds * TIMING_SAMPLE_INTERVAL,
+            "phone_extraction": self.extraction_seconds * TIMING_SAMPLE_INTERVAL,
+            "phone_validation": self.validation_seconds,
+        }
+    
+    def merge(self, other: "ParseStats") -> None:
+        """Add the stage timings and validations of another parse (e.g. a chunk)"""
+        self.validations += other.validations
+        self.message_seconds += other.message_seconds
+        self.timestamp_seconds += other.timestamp_seconds
+        self.extraction_seconds += other.extraction_seconds
+        self.validation_seconds += other.validation_seconds
+
+def _make_fast_timestamp_parser(fmt: str) -> Callable[[str], Optional[datetime]]:
+    """
+    Build a parser that gives the same result as datetime.strptime(value, fmt)
+    for one of the WhatsApp timestamp formats, but returns None instead of
+    raising when the value does not fit.
+    """
+    separator = re.escape(fmt[2])
+    day_first = fmt.startswith('%d')
+    year_digits = 4 if '%Y' in fmt else 2
+    twelve_hour = '%p' in fmt
+    regex = re.compile(
+        rf'([0-9]{{1,2}}){separator}([0-9]{{1,2}}){separator}([0-9]{{{year_digits}}}),\s+([0-9]{{1,2}}):([0-9]{{1,2}})'
+        + (r':([0-9]{1,2})' if '%S' in fmt else r'()')
+        + (r'\s+([AP]M)' if twelve_hour else r'()')
+        + r'\Z'
+    )
+    
+    def parse(value: str) -> Optional[datetime]:
+        match = regex.match(value)
+        if match is None:
+            return None
+        first, second, year, hour, minute, seconds, meridiem = match.groups()
+        day, month = (first, second) if day_first else (second, first)
+        year = int(year)
+        if year_digits == 2:
+            # Same pivot as strptime's %y
+            year += 2000 if year <= 68 else 1900
+        hour = int(hour)
+        if twelve_hour:
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if meridiem == 'PM' else 0)
+        try:
+            return datetime(year, int(month), int(day), hour, int(minute), int(seconds) if seconds else 0)
+        except ValueError:
+            return None
+    
+    return parse
+
+# Parser instance of a pool worker process, created on first use
+_worker_parser = None
+
+def _get_worker_parser() -> "WhatsAppParser":
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = WhatsAppParser()
+    return _worker_parser
+
+def _collect_chunk(
+    chunk: str, file_format: Optional[ChatFormat] = None
+) -> Tuple[List[Tuple[str, Optional[datetime], Optional[str]]], Set[str], ParseStats]:
+    """
+    Collect the phone candidates of one chunk inside a pool worker.
+    Candidates are returned as plain tuples in first-seen order to keep pickling cheap.
+    """
+    candidates: Candidates = {}
+    sender_names: Set[str] = set()
+    stats = ParseStats()
+    _get_worker_parser()._collect_candidates(chunk.split('\n'), candidates, sender_names, file_format, stats=stats)
+    return [(cleaned, timestamp, name) for cleaned, (timestamp, name) in candidates.items()], sender_names, stats
+
+def _normalize_batch(batch: List[str]) -> List[Optional[str]]:
+    """Validate a batch of cleaned candidates inside a pool worker"""
+    parser = _get_worker_parser()
+    return [parser._normalize_phone(cleaned) for cleaned in batch]
+
 class WhatsAppParser:
     """
     Parses WhatsApp exported chat files to extract phone numbers and metadata.
     Supports multiple formats and international phone numbers.
     """
     
-    def __init__(self):
+    def __init__(self, phone_cache: Optional[PhoneNormalizationCache] = None):
         # Regex patterns for different WhatsApp formats
         # Format 1: [DD/MM/YY, HH:MM:SS] Name: Message
         # Format 2: DD/MM/YY, HH:MM - Name: Message
@@ -34,50 +251,144 @@ class WhatsAppParser:
         # Compile patterns
         self.compiled_message_patterns = [re.compile(p, re.MULTILINE) for p in self.message_patterns]
         self.compiled_phone_patterns = [re.compile(p) for p in self.phone_patterns]
+        
+        # International numbers and digit runs found in one scan. Every match of
+        # the Nigerian 0xxx pattern is also a whole 10-15 digit run, so it needs
+        # no alternative of its own
+        self.phone_candidate_pattern = re.compile(f'({self.phone_patterns[0]})|{self.phone_patterns[1]}')
+        
+        # Common timestamp formats, tried in order when a file's format is unknown
+        self.timestamp_formats = [
+            '%d/%m/%Y, %H:%M:%S',
+            '%d/%m/%y, %H:%M:%S',
+            '%d/%m/%Y, %H:%M',
+            '%d/%m/%y, %H:%M',
+            '%d-%m-%Y, %H:%M:%S',
+            '%d-%m-%y, %H:%M:%S',
+            '%m/%d/%Y, %I:%M:%S %p',
+            '%m/%d/%y, %I:%M %p',
+        ]
+        self.fast_timestamp_parsers = {fmt: _make_fast_timestamp_parser(fmt) for fmt in self.timestamp_formats}
+        
+        # Normalization results, shared by every parser in the process by default
+        self.phone_cache = phone_cache if phone_cache is not None else shared_phone_cache
     
-    def parse_chat_file(self, content: str, filename: str = "chat.txt") -> Tuple[List[ParsedLead], Set[str]]:
+    def parse_chat_file(
+        self,
+        content: str,
+        filename: str = "chat.txt",
+        progress: Optional[ProgressCallback] = None,
+        stats: Optional[ParseStats] = None,
+        executor: Optional[Executor] = None
+    ) -> Tuple[List[LeadRecord], Set[str]]:
         """
         Parse WhatsApp chat content and extract phone numbers.
+        Counts and stage timings are added to stats, if given. Large batches
+        of uncached candidates are validated on executor, if given.
         
         Returns:
-            Tuple of (list of ParsedLead objects, set of sender names found)
+            Tuple of (list of LeadRecord tuples, set of sender names found)
         """
-        leads: Dict[str, ParsedLead] = {}  # Use dict to handle duplicates
+        leads: Dict[str, LeadRecord] = {}  # Use dict to handle duplicates
         sender_names: Set[str] = set()
         
         try:
             lines = content.split('\n')
             logger.info(f"Parsing {len(lines)} lines from {filename}")
             
-            for line in lines:
-                if not line.strip():
-                    continue
+            file_format = self.detect_format(lines[:DETECT_SAMPLE_LINES])
+            self._parse_lines(lines, leads, sender_names, file_format, progress, stats, executor)
+            
+            logger.info(f"Extracted {len(leads)} unique phone numbers from {filename}")
+            return list(leads.values()), sender_names
+            
+        except Exception as e:
+            logger.error(f"Error parsing chat file {filename}: {str(e)}")
+            raise
+    
+    def parse_chat_file_parallel(
+        self,
+        content: str,
+        filename: str = "chat.txt",
+        executor: Optional[Executor] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        stats: Optional[ParseStats] = None
+    ) -> Tuple[List[LeadRecord], Set[str]]:
+        """
+        Parse WhatsApp chat content in line-aligned chunks on a process pool.
+        Produces the same result as parse_chat_file: the candidates collected
+        from each chunk are merged in file order, so the first occurrence of
+        each phone keeps its first_seen and name, and then validated once.
+        
+        Returns:
+            Tuple of (list of LeadRecord tuples, set of sender names found)
+        """
+        chunks = list(split_into_chunks(content, chunk_size))
+        if executor is None or len(chunks) < 2:
+            return self.parse_chat_file(content, filename, progress, stats, executor)
+        
+        if stats is None:
+            stats = ParseStats()
+        candidates: Candidates = {}
+        leads: Dict[str, LeadRecord] = {}
+        sender_names: Set[str] = set()
+        
+        try:
+            logger.info(f"Parsing {filename} in {len(chunks)} chunks")
+            
+            file_format = self.detect_format(chunks[0].split('\n', DETECT_SAMPLE_LINES)[:DETECT_SAMPLE_LINES])
+            lines_processed = 0
+            results = executor.map(_collect_chunk, chunks, repeat(file_format))
+            for chunk, (chunk_candidates, chunk_senders, chunk_stats) in zip(chunks, results):
+                sender_names.update(chunk_senders)
+                stats.merge(chunk_stats)
+                for cleaned, timestamp, display_name in chunk_candidates:
+                    if cleaned not in candidates:
+                        candidates[cleaned] = (timestamp, display_name)
                 
-                # Try to match message pattern
-                parsed = self._parse_message_line(line)
-                if parsed:
-                    timestamp, sender_name, message = parsed
-                    sender_names.add(sender_name)
-                    
-                    # Check if sender name is a phone number
-                    phone = self._extract_and_validate_phone(sender_name)
-                    if phone:
-                        if phone not in leads:
-                            leads[phone] = ParsedLead(
-                                phone_number=phone,
-                                display_name=sender_name,
-                                first_seen=timestamp
-                            )
-                    
-                    # Extract phone numbers from message content
-                    phones_in_message = self._extract_phones_from_text(message)
-                    for phone in phones_in_message:
-                        if phone not in leads:
-                            leads[phone] = ParsedLead(
-                                phone_number=phone,
-                                display_name=None,
-                                first_seen=timestamp
-                            )
+                lines_processed += chunk.count('\n') + 1
+                if progress:
+                    progress(lines_processed, len(candidates))
+            
+            self._validate_candidates(candidates, leads, stats, executor)
+            stats.lines += lines_processed
+            stats.numbers += len(leads)
+            if progress:
+                progress(lines_processed, len(leads))
+            logger.info(f"Extracted {len(leads)} unique phone numbers from {filename}")
+            return list(leads.values()), sender_names
+            
+        except Exception as e:
+            logger.error(f"Error parsing chat file {filename}: {str(e)}")
+            raise
+    
+    def parse_chat_stream(
+        self,
+        lines: Iterable[str],
+        filename: str = "chat.txt",
+        progress: Optional[ProgressCallback] = None,
+        stats: Optional[ParseStats] = None,
+        executor: Optional[Executor] = None
+    ) -> Tuple[List[LeadRecord], Set[str]]:
+        """
+        Parse WhatsApp chat lines as they are produced, e.g. by iter_decoded_lines,
+        without holding the whole file in memory. Only the distinct phone
+        candidates are kept until the lines are consumed.
+        
+        Returns:
+            Tuple of (list of LeadRecord tuples, set of sender names found)
+        """
+        leads: Dict[str, LeadRecord] = {}
+        sender_names: Set[str] = set()
+        
+        try:
+            logger.info(f"Streaming lines from {filename}")
+            
+            lines = iter(lines)
+            sample = list(islice(lines, DETECT_SAMPLE_LINES))
+            file_format = self.detect_format(sample)
+            self._parse_lines(chain(sample, lines), leads, sender_names, file_format, progress, stats, executor)
             
             logger.info(f"Extracted {len(leads)} unique phone numbers from {filename}")
             return list(leads.values()), sender_names
@@ -86,37 +397,316 @@ class WhatsAppParser:
             logger.error(f"Error parsing chat file {filename}: {str(e)}")
             raise
     
-    def _parse_message_line(self, line: str) -> Optional[Tuple[Optional[datetime], str, str]]:
+    def parse_chat_streams(
+        self,
+        sources: Sequence[Tuple[str, Iterable[str]]],
+        progress: Optional[ProgressCallback] = None,
+        stats: Optional[ParseStats] = None,
+        executor: Optional[Executor] = None
+    ) -> Tuple[List[LeadRecord], Set[str]]:
+        """
+        Parse several chats, e.g. the members of an exported archive, into one
+        result. sources are (filename, lines) pairs; each chat is read on its
+        own thread with its own detected format. The candidates are merged in
+        source order, as if the chats were one file, and validated once.
+        
+        Returns:
+            Tuple of (list of LeadRecord tuples, set of sender names found)
+        """
+        if stats is None:
+            stats = ParseStats()
+        leads: Dict[str, LeadRecord] = {}
+        sender_names: Set[str] = set()
+        if not sources:
+            return [], sender_names
+        
+        # Latest (lines, candidates) reported by each source
+        counts = [(0, 0)] * len(sources)
+        
+        def collect(index: int, filename: str, lines: Iterable[str]) -> Tuple[Candidates, Set[str], ParseStats, int]:
+            logger.info(f"Streaming lines from {filename}")
+            def report(line_count: int, candidate_count: int) -> None:
+                counts[index] = (line_count, candidate_count)
+                progress(sum(c[0] for c in counts), sum(c[1] for c in counts))
+            
+            source_progress = report if progress else None
+            
+            candidates: Candidates = {}
+            source_senders: Set[str] = set()
+            source_stats = ParseStats()
+            lines = iter(lines)
+            sample = list(islice(lines, DETECT_SAMPLE_LINES))
+            line_count = self._collect_candidates(
+                chain(sample, lines), candidates, source_senders, self.detect_format(sample), source_progress,
+                source_stats
+            )
+            return candidates, source_senders, source_stats, line_count
+        
+        try:
+            with ThreadPoolExecutor(max_workers=min(len(sources), MAX_STREAM_THREADS)) as threads:
+                futures = [
+                    threads.submit(collect, index, filename, lines) for index, (filename, lines) in enumerate(sources)
+                ]
+                results = [future.result() for future in futures]
+            
+            candidates: Candidates = {}
+            line_count = 0
+            for source_candidates, source_senders, source_stats, source_lines in results:
+                sender_names.update(source_senders)
+                stats.merge(source_stats)
+                line_count += source_lines
+                for cleaned, occurrence in source_candidates.items():
+                    if cleaned not in candidates:
+                        candidates[cleaned] = occurrence
+            
+            self._validate_candidates(candidates, leads, stats, executor)
+            stats.lines += line_count
+            stats.numbers += len(leads)
+            if progress:
+                progress(line_count, len(leads))
+            logger.info(f"Extracted {len(leads)} unique phone numbers from {len(sources)} chats")
+            return list(leads.values()), sender_names
+            
+        except Exception as e:
+            logger.error(f"Error parsing chats {', '.join(name for name, _ in sources)}: {str(e)}")
+            raise
+    
+    def detect_format(self, sample_lines: Iterable[str]) -> Optional[ChatFormat]:
+        """
+        Detect the message pattern and timestamp format used by a file
+        from a sample of its lines.
+        
+        Returns:
+            The most common pattern and timestamp format, or None if no line matched
+        """
+        pattern_hits = [0] * len(self.compiled_message_patterns)
+        timestamps: List[str] = []
+        for line in sample_lines:
+            for i, pattern in enumerate(self.compiled_message_patterns):
+                match = pattern.match(line)
+                if match:
+                    pattern_hits[i] += 1
+                    timestamps.append(match.group(1).strip('[]').strip())
+                    break
+        
+        if not timestamps:
+            return None
+        
+        format_hits = {
+            fmt: sum(1 for ts in timestamps if self.fast_timestamp_parsers[fmt](ts) is not None)
+            for fmt in self.timestamp_formats
+        }
+        best_format = max(self.timestamp_formats, key=lambda fmt: format_hits[fmt])
+        return ChatFormat(
+            pattern_index=pattern_hits.index(max(pattern_hits)),
+            timestamp_format=best_format if format_hits[best_format] else None
+        )
+    
+    def last_message_time(self, lines: Sequence[str]) -> Optional[datetime]:
+        """Timestamp of the last message among lines, e.g. the trailing lines of a chat"""
+        file_format = self.detect_format(lines)
+        for line in reversed(lines):
+            parsed = self._parse_message_line(line, file_format)
+            if parsed:
+                return parsed[0]
+        return None
+
+    def _parse_lines(
+        self,
+        lines: Iterable[str],
+        leads: Dict[str, LeadRecord],
+        sender_names: Set[str],
+        file_format: Optional[ChatFormat] = None,
+        progress: Optional[ProgressCallback] = None,
+        stats: Optional[ParseStats] = None,
+        executor: Optional[Executor] = None
+    ) -> None:
+        """
+        Parse message lines, adding the first occurrence of each phone to leads.
+        Candidates are collected from every line first and then each distinct
+        one is validated once. progress, if given, is called every
+        PROGRESS_INTERVAL lines and at the end.
+        """
+        if stats is None:
+            stats = ParseStats()
+        candidates: Candidates = {}
+        line_count = self._collect_candidates(lines, candidates, sender_names, file_format, progress, stats)
+        self._validate_candidates(candidates, leads, stats, executor)
+        
+        stats.lines += line_count
+        stats.numbers += len(leads)
+        if progress:
+            progress(line_count, len(leads))
+    
+    def _collect_candidates(
+        self,
+        lines: Iterable[str],
+        candidates: Candidates,
+        sender_names: Set[str],
+        file_format: Optional[ChatFormat] = None,
+        progress: Optional[ProgressCallback] = None,
+        stats: Optional[ParseStats] = None
+    ) -> int:
+        """
+        Record the first occurrence of each cleaned phone candidate in message
+        lines: senders whose name looks like a number, then numbers in the
+        message text, without validating any of them.
+        
+        Returns:
+            Number of lines read
+        """
+        if stats is None:
+            stats = ParseStats()
+        clock = time.perf_counter
+        line_number = 0
+        for line_number, line in enumerate(lines, 1):
+            if progress and line_number % PROGRESS_INTERVAL == 0:
+                progress(line_number, len(candidates))
+            
+            if not line.strip():
+                continue
+            
+            timed = stats.timing = line_number % TIMING_SAMPLE_INTERVAL == 0
+            
+            # Try to match message pattern
+            if timed:
+                started = clock()
+            parsed = self._parse_message_line(line, file_format, stats)
+            if timed:
+                stats.message_seconds += clock() - started
+            if parsed:
+                timestamp, sender_name, message = parsed
+                sender_names.add(sender_name)
+                
+                if timed:
+                    started = clock()
+                
+                # Check if sender name is a phone number
+                cleaned = self._clean_candidate(sender_name)
+                if cleaned is not None and cleaned not in candidates:
+                    candidates[cleaned] = (timestamp, sender_name)
+                
+                # Extract phone numbers from message content
+                for cleaned in self._iter_phone_candidates(message):
+                    if cleaned not in candidates:
+                        candidates[cleaned] = (timestamp, None)
+                
+                if timed:
+                    stats.extraction_seconds += clock() - started
+        
+        stats.timing = False
+        return line_number
+    
+    def _validate_candidates(
+        self,
+        candidates: Candidates,
+        leads: Dict[str, LeadRecord],
+        stats: Optional[ParseStats] = None,
+        executor: Optional[Executor] = None
+    ) -> None:
+        """
+        Validate each collected candidate once and add the first occurrence of
+        each valid phone to leads. Candidates are visited in first-seen order,
+        so a phone written several ways keeps its earliest occurrence.
+        """
+        phones = self._normalize_candidates(list(candidates), stats, executor)
+        for (timestamp, display_name), phone in zip(candidates.values(), phones):
+            if phone and phone not in leads:
+                leads[phone] = LeadRecord(phone, display_name, timestamp)
+    
+    def _normalize_candidates(
+        self,
+        cleaned_candidates: List[str],
+        stats: Optional[ParseStats] = None,
+        executor: Optional[Executor] = None
+    ) -> List[Optional[str]]:
+        """
+        Normalize cleaned candidates through the phone cache. Cache misses are
+        validated with phonenumbers, in batches on executor when there are at
+        least PARALLEL_VALIDATION_THRESHOLD of them and an executor is given.
+        
+        Returns:
+            E.164 number or None for each candidate, in order
+        """
+        results: List[Optional[str]] = []
+        misses: List[int] = []
+        for index, cleaned in enumerate(cleaned_candidates):
+            cached = self.phone_cache.get(cleaned)
+            if cached is MISSING:
+                misses.append(index)
+                cached = None
+            results.append(cached)
+        if not misses:
+            return results
+        
+        started = time.perf_counter()
+        uncached = [cleaned_candidates[index] for index in misses]
+        if executor is not None and len(uncached) >= PARALLEL_VALIDATION_THRESHOLD:
+            batches = [uncached[i:i + VALIDATION_BATCH_SIZE] for i in range(0, len(uncached), VALIDATION_BATCH_SIZE)]
+            phones = [phone for batch in executor.map(_normalize_batch, batches) for phone in batch]
+        else:
+            phones = [self._normalize_phone(cleaned) for cleaned in uncached]
+        
+        for index, cleaned, phone in zip(misses, uncached, phones):
+            self.phone_cache.put(cleaned, phone)
+            results[index] = phone
+        
+        if stats is not None:
+            stats.validations += len(uncached)
+            stats.validation_seconds += time.perf_counter() - started
+        return results
+    
+    def _parse_message_line(
+        self, line: str, file_format: Optional[ChatFormat] = None, stats: Optional[ParseStats] = None
+    ) -> Optional[Tuple[Optional[datetime], str, str]]:
         """
         Parse a single message line to extract timestamp, sender, and message.
+        The file's detected pattern is tried first, then every other pattern.
         """
+        if file_format is not None:
+            detected_pattern = self.compiled_message_patterns[file_format.pattern_index]
+            match = detected_pattern.match(line)
+            if match:
+                timestamp_str, sender_name, message = match.groups()
+                if stats is None or not stats.timing:
+                    timestamp = self._parse_timestamp(timestamp_str, file_format.timestamp_format)
+                else:
+                    started = time.perf_counter()
+                    timestamp = self._parse_timestamp(timestamp_str, file_format.timestamp_format)
+                    stats.timestamp_seconds += time.perf_counter() - started
+                return timestamp, sender_name.strip(), message.strip()
+        else:
+            detected_pattern = None
+        
         for pattern in self.compiled_message_patterns:
+            if pattern is detected_pattern:
+                continue
             match = pattern.match(line)
             if match:
                 timestamp_str, sender_name, message = match.groups()
-                timestamp = self._parse_timestamp(timestamp_str)
+                if stats is None or not stats.timing:
+                    timestamp = self._parse_timestamp(timestamp_str)
+                else:
+                    started = time.perf_counter()
+                    timestamp = self._parse_timestamp(timestamp_str)
+                    stats.timestamp_seconds += time.perf_counter() - started
                 return timestamp, sender_name.strip(), message.strip()
         return None
     
-    def _parse_timestamp(self, timestamp_str: str) -> Optional[datetime]:
+    def _parse_timestamp(self, timestamp_str: str, detected_format: Optional[str] = None) -> Optional[datetime]:
         """
         Parse timestamp from various formats.
+        The file's detected format goes through its fast parser before falling
+        back to strptime with every known format.
         """
         timestamp_str = timestamp_str.strip('[]').strip()
         
-        # Common timestamp formats
-        formats = [
-            '%d/%m/%Y, %H:%M:%S',
-            '%d/%m/%y, %H:%M:%S',
-            '%d/%m/%Y, %H:%M',
-            '%d/%m/%y, %H:%M',
-            '%d-%m-%Y, %H:%M:%S',
-            '%d-%m-%y, %H:%M:%S',
-            '%m/%d/%Y, %I:%M:%S %p',
-            '%m/%d/%y, %I:%M %p',
-        ]
+        if detected_format is not None:
+            timestamp = self.fast_timestamp_parsers[detected_format](timestamp_str)
+            if timestamp is not None:
+                return timestamp
         
-        for fmt in formats:
+        for fmt in self.timestamp_formats:
             try:
                 return datetime.strptime(timestamp_str, fmt)
             except ValueError:
@@ -125,62 +715,85 @@ class WhatsAppParser:
         logger.warning(f"Could not parse timestamp: {timestamp_str}")
         return None
     
-    def _extract_phones_from_text(self, text: str) -> List[str]:
+    def _iter_phone_candidates(self, text: str) -> Iterator[str]:
+        """
+        Yield each distinct cleaned phone candidate in text once, in text order.
+        Finds the same candidates as running every phone pattern with findall,
+        but in a single scan; digit runs inside an international number are
+        still candidates of their own. Candidates whose length rules them out
+        are dropped before validation.
+        """
+        if len(text) < MIN_PHONE_LENGTH:
+            return
+        
+        digit_run_pattern = self.compiled_phone_patterns[1]
+        seen: Set[str] = set()
+        for match in self.phone_candidate_pattern.finditer(text):
+            international = match.group(1)
+            if international is None:
+                # A digit run is already clean and its length is bounded by the pattern
+                candidates = [match.group()]
+            else:
+                candidates = [_NON_PHONE_CHARS.sub('', international)]
+                # endpos one past the match keeps the closing \b check on the real text
+                runs = digit_run_pattern.finditer(text, match.start(), match.end() + 1)
+                candidates.extend(run.group() for run in runs)
+            
+            for cleaned in candidates:
+                if cleaned not in seen and MIN_PHONE_LENGTH <= len(cleaned) <= MAX_PHONE_LENGTH:
+                    seen.add(cleaned)
+                    yield cleaned
+    
+    def _clean_candidate(self, text: str) -> Optional[str]:
         """
-        Extract and validate phone numbers from text.
+        Strip a phone-like string to its digits and '+', or return None if its
+        length rules it out.
         """
-        phones = []
-        for pattern in self.compiled_phone_patterns:
-            matches = pattern.findall(text)
-            for match in matches:
-                phone = self._extract_and_validate_phone(match)
-                if phone:
-                    phones.append(phone)
-        return phones
+        cleaned = _NON_PHONE_CHARS.sub('', text)
+        if len(cleaned) < MIN_PHONE_LENGTH or len(cleaned) > MAX_PHONE_LENGTH:
+            return None
+        return cleaned
     
     def _extract_and_validate_phone(self, text: str) -> Optional[str]:
         """
         Extract and validate a phone number, returning normalized format.
         """
+        cleaned = self._clean_candidate(text)
+        if cleaned is None:
+            return None
+        return self._normalize_candidates([cleaned])[0]
+    
+    def _normalize_phone(self, cleaned: str) -> Optional[str]:
+        """
+        Validate a cleaned candidate with phonenumbers, returning E.164 format.
+        """
+        # Try parsing as Nigerian number first
         try:
-            # Clean the text
-            cleaned = re.sub(r'[^\d+]', '', text)
-            
-            # Skip if too short or too long
-            if len(cleaned) < 10 or len(cleaned) > 15:
-                return None
-            
-            # Try parsing as Nigerian number first
-            try:
-                parsed = phonenumbers.parse(cleaned, "NG")
-                if phonenumbers.is_valid_number(parsed):
-                    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-            except:
-                pass
-            
-            # Try parsing with + prefix
-            if not cleaned.startswith('+'):
-                cleaned_with_plus = '+' + cleaned
-                try:
-                    parsed = phonenumbers.parse(cleaned_with_plus, None)
-                    if phonenumbers.is_valid_number(parsed):
-                        return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-                except:
-                    pass
-            
-            # Try parsing without region
+            parsed = phonenumbers.parse(cleaned, "NG")
+            if phonenumbers.is_valid_number(parsed):
+                return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+        except:
+            pass
+        
+        # Try parsing with + prefix
+        if not cleaned.startswith('+'):
+            cleaned_with_plus = '+' + cleaned
             try:
-                parsed = phonenumbers.parse(cleaned, None)
+                parsed = phonenumbers.parse(cleaned_with_plus, None)
                 if phonenumbers.is_valid_number(parsed):
                     return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
             except:
                 pass
-            
-            return None
-            
-        except Exception as e:
-            logger.debug(f"Could not validate phone: {text} - {str(e)}")
-            return None
+        
+        # Try parsing without region
+        try:
+            parsed = phonenumbers.parse(cleaned, None)
+            if phonenumbers.is_valid_number(parsed):
+                return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+        except:
+            pass
+        
+        return None
     
     def is_likely_phone_number(self, name: str) -> bool:
         """
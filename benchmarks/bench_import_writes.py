@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark the import write phase: MongoDB round trips per import for the
+old per-lead find_one/update_one loop versus the batched bulk upserts.
+
+Requires a local MongoDB (MONGO_URL, defaults to mongodb://localhost:27017).
+"""
+
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "leadengine_bench")
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+import server
+from models import Lead
+from whatsapp_parser import LeadRecord
+
+SIZES = [1_000, 5_000, 20_000]
+USER_ID = "bench_user"
+
+
+class RoundTripCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def make_parsed_leads(n: int):
+    base = datetime(2024, 1, 1)
+    return [
+        LeadRecord(
+            phone_number=f"+23480{i:08d}",
+            display_name=None,
+            first_seen=base + timedelta(minutes=i)
+        )
+        for i in range(n)
+    ]
+
+
+async def legacy_write(parsed_leads, import_id):
+    """The pre-bulk write phase of parse_import, kept here for comparison"""
+    leads_to_store = []
+    for parsed_lead in parsed_leads:
+        existing = await server.db.leads.find_one({
+            "user_id": USER_ID,
+            "phone_number": parsed_lead.phone_number
+        })
+        if existing:
+            await server.db.leads.update_one(
+                {"_id": existing["_id"]},
+                {"$set": {"last_seen": datetime.utcnow()}}
+            )
+        else:
+            lead = Lead(
+                user_id=USER_ID,
+                phone_number=parsed_lead.phone_number,
+                first_seen=parsed_lead.first_seen,
+                import_id=import_id
+            )
+            leads_to_store.append(lead.dict())
+    if leads_to_store:
+        await server.db.leads.insert_many(leads_to_store)
+    return len(leads_to_store)
+
+
+async def bulk_write(parsed_leads, import_id):
+    return await server.upsert_parsed_leads(USER_ID, parsed_leads, "bench.txt", import_id)
+
+
+async def measure(counter, write, parsed_leads):
+    await server.db.leads.delete_many({"user_id": USER_ID})
+    results = {}
+    # First pass inserts every lead, second pass finds them all existing
+    for phase in ("insert", "reimport"):
+        counter.count = 0
+        started = time.perf_counter()
+        await write(parsed_leads, str(uuid.uuid4()))
+        results[phase] = (counter.count, time.perf_counter() - started)
+    return results
+
+
+async def main():
+    counter = RoundTripCounter()
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"], event_listeners=[counter])
+    server.db = client[os.environ["DB_NAME"]]
+    # Objects built on server.db at import time, so their round trips are counted too
+    server.lead_changes.db = server.db
+    server.quotas.db = server.db
+    await server.create_indexes()
+
+    print(f"batch_size={server.IMPORT_WRITE_BATCH_SIZE}")
+    print(f"{'leads':>8} {'mode':>7} {'phase':>9} {'round trips':>12} {'seconds':>9}")
+    for n in SIZES:
+        parsed_leads = make_parsed_leads(n)
+        for mode, write in (("legacy", legacy_write), ("bulk", bulk_write)):
+            results = await measure(counter, write, parsed_leads)
+            for phase, (trips, seconds) in results.items():
+                print(f"{n:>8} {mode:>7} {phase:>9} {trips:>12} {seconds:>9.2f}")
+
+    await server.db.leads.delete_many({"user_id": USER_ID})
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark lead search at 100k and 1M leads per user: the old unanchored
+case-insensitive $regex on phone_number/display_name versus lookups on the
+indexed search_keys field.
+
+Requires a local MongoDB (MONGO_URL, defaults to mongodb://localhost:27017).
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "leadengine_bench")
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+import server
+from lead_search import build_search_keys, build_search_query
+from models import Lead
+
+SIZES = [100_000, 1_000_000]
+USER_ID = "bench_search_user"
+QUERIES = ["8031", "234803123", "45678", "ade", "chi okafor", "zz"]
+RUNS = 5
+PAGE_LIMIT = 100
+
+FIRST_NAMES = ["Adeola", "Chinedu", "Ngozi", "Tunde", "Amaka", "Emeka", "Funke", "Ibrahim", "Chioma", "Segun"]
+LAST_NAMES = ["Okafor", "Adeyemi", "Bello", "Eze", "Ogunleye", "Musa", "Nwosu", "Balogun"]
+
+
+async def seed(n: int):
+    await server.db.leads.delete_many({"user_id": USER_ID})
+    rng = random.Random(n)
+    now = datetime.utcnow()
+    import_id = str(uuid.uuid4())
+    batch = []
+    for i in range(n):
+        phone = f"+234{rng.choice('789')}{rng.choice('01')}{rng.randrange(10 ** 8):08d}"
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" if rng.random() < 0.4 else None
+        lead = Lead(
+            user_id=USER_ID,
+            phone_number=phone,
+            display_name=name,
+            last_seen=now - timedelta(minutes=i),
+            import_id=import_id,
+            search_keys=build_search_keys(phone, name)
+        )
+        batch.append(lead.dict())
+        if len(batch) == 10_000:
+            await server.db.leads.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await server.db.leads.insert_many(batch, ordered=False)
+
+
+def regex_query(search: str):
+    return {
+        "user_id": USER_ID,
+        "$or": [
+            {"phone_number": {"$regex": search, "$options": "i"}},
+            {"display_name": {"$regex": search, "$options": "i"}}
+        ]
+    }
+
+
+def keys_query(search: str):
+    return {"user_id": USER_ID, **(build_search_query(search) or {})}
+
+
+async def time_query(query):
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await server.db.leads.find(query).sort("last_seen", -1).limit(PAGE_LIMIT).to_list(PAGE_LIMIT)
+        await server.db.leads.count_documents(query)
+        timings.append(time.perf_counter() - started)
+    plan = await server.db.leads.find(query).sort("last_seen", -1).limit(PAGE_LIMIT).explain()
+    examined = plan.get("executionStats", {}).get("totalDocsExamined", "?")
+    return statistics.median(timings) * 1000, examined
+
+
+async def main():
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    server.db = client[os.environ["DB_NAME"]]
+    await server.create_indexes()
+
+    print(f"{'leads':>9} {'query':>12} {'regex ms':>9} {'regex docs':>11} {'keys ms':>8} {'keys docs':>10}")
+    for n in SIZES:
+        await seed(n)
+        for search in QUERIES:
+            regex_ms, regex_docs = await time_query(regex_query(search))
+            keys_ms, keys_docs = await time_query(keys_query(search))
+            print(f"{n:>9} {search:>12} {regex_ms:>9.1f} {regex_docs:>11} {keys_ms:>8.1f} {keys_docs:>10}")
+
+    await server.db.leads.delete_many({"user_id": USER_ID})
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark WhatsAppParser line parsing for every supported timestamp format:
+lines per second without format detection (every pattern and strptime format
+tried per line) versus with per-file detection and the fast timestamp parser.
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from chat_generator import ChatSpec, generate_chat_lines
+from whatsapp_parser import WhatsAppParser, DETECT_SAMPLE_LINES
+
+LINES = 50_000
+REPEATS = 3
+
+# Generator layout per timestamp format, matching WhatsAppParser.message_patterns
+FORMAT_LAYOUTS = {
+    '%d/%m/%Y, %H:%M:%S': 'bracketed',
+    '%d/%m/%y, %H:%M:%S': 'bracketed',
+    '%d/%m/%Y, %H:%M': 'dashed',
+    '%d/%m/%y, %H:%M': 'dashed',
+    '%d-%m-%Y, %H:%M:%S': 'hyphen_date',
+    '%d-%m-%y, %H:%M:%S': 'hyphen_date',
+    '%m/%d/%Y, %I:%M:%S %p': 'bracketed',
+    '%m/%d/%y, %I:%M %p': 'dashed',
+}
+
+
+def generate_lines(fmt: str, count: int):
+    spec = ChatSpec(lines=count, layout=FORMAT_LAYOUTS[fmt], timestamp_format=fmt, continuation_ratio=0)
+    return list(generate_chat_lines(spec))
+
+
+def best_of(fn):
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    logging.disable(logging.WARNING)
+    parser = WhatsAppParser()
+
+    print(f"{'format':<24} {'before (lines/s)':>17} {'after (lines/s)':>16} {'speedup':>8}")
+    for fmt in FORMAT_LAYOUTS:
+        lines = generate_lines(fmt, LINES)
+
+        before = best_of(lambda: parser._parse_lines(lines, {}, set(), None))
+        file_format = parser.detect_format(lines[:DETECT_SAMPLE_LINES])
+        assert file_format.timestamp_format == fmt, file_format
+        after = best_of(lambda: parser._parse_lines(lines, {}, set(), file_format))
+
+        print(f"{fmt:<24} {LINES / before:>17,.0f} {LINES / after:>16,.0f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark encoding lead pages of 100, 1k and 10k leads as API responses:
+FastAPI's default path (serialize_doc, jsonable_encoder, json.dumps and,
+for imports, response_model validation) versus fast_json.FastJSONResponse
+with orjson, for whole documents and for the fields the app's list view
+requests.
+
+Runs offline on synthetic documents shaped like MongoDB results.
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Union
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from fast_json import FastJSONResponse
+from models import ImportJobResponse, ImportParseResponse, ImportSummaryResponse, ParsedLead
+
+SIZES = [100, 1_000, 10_000]
+RUNS = 7
+
+# What the leads screen renders (see frontend/app/(tabs)/leads.tsx)
+LIST_FIELDS = ("_id", "phone_number", "display_name", "source_chat", "is_saved", "last_seen")
+
+NAMES = ["Adeola", "Chinedu", "Ngozi", "Tunde", "Amaka", "Emeka", "Funke", "Ibrahim", "Chioma", "Segun"]
+
+
+def make_leads(n: int):
+    """Lead documents as motor returns them with the list projection"""
+    rng = random.Random(n)
+    now = datetime.utcnow().replace(microsecond=123000)
+    import_id = str(uuid.uuid4())
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": "demo_user",
+            "phone_number": f"+234803{rng.randrange(10 ** 7):07d}",
+            "display_name": rng.choice(NAMES) if rng.random() < 0.4 else None,
+            "source_chat": "WhatsApp Chat with Customers.txt",
+            "first_seen": now - timedelta(days=rng.randrange(365)),
+            "last_seen": now - timedelta(minutes=i),
+            "import_id": import_id,
+            "is_saved": rng.random() < 0.3,
+            "tags": [],
+            "notes": None,
+            "created_at": now,
+        }
+        for i in range(n)
+    ]
+
+
+def median_ms(encode) -> float:
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        encode()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def default_list(leads) -> bytes:
+    # The former get_leads path: copy, stringify _id, jsonable_encoder, json.dumps
+    docs = [dict(lead, _id=str(lead["_id"])) for lead in leads]
+    return JSONResponse(jsonable_encoder({"leads": docs, "total": len(docs)})).body
+
+
+def fast_list(leads) -> bytes:
+    return FastJSONResponse({"leads": leads, "total": len(leads)}).body
+
+
+def import_result(leads) -> ImportParseResponse:
+    return ImportParseResponse(
+        import_id=str(uuid.uuid4()),
+        leads=[ParsedLead(phone_number=lead["phone_number"], display_name=lead["display_name"],
+                          first_seen=lead["first_seen"]) for lead in leads],
+        total_count=len(leads),
+        duplicates_removed=0,
+    )
+
+
+def default_import(result: ImportParseResponse) -> bytes:
+    # FastAPI revalidates against the Union response_model before encoding
+    field = create_response_field(
+        name="response", type_=Union[ImportParseResponse, ImportSummaryResponse, ImportJobResponse]
+    )
+    content = asyncio.run(serialize_response(field=field, response_content=result))
+    return JSONResponse(content).body
+
+
+def main():
+    print(f"{'leads':>7} {'payload':>8} {'default ms':>11} {'orjson ms':>10} {'speedup':>8}")
+    for n in SIZES:
+        leads = make_leads(n)
+        listed = [{field: lead[field] for field in LIST_FIELDS} for lead in leads]
+        result = import_result(leads)
+        cases = [
+            ("full", lambda: default_list(leads), lambda: fast_list(leads)),
+            ("fields", lambda: default_list(listed), lambda: fast_list(listed)),
+            ("import", lambda: default_import(result), lambda: FastJSONResponse(result.dict()).body),
+        ]
+        for name, default, fast in cases:
+            default_ms = median_ms(default)
+            fast_ms = median_ms(fast)
+            print(f"{n:>7} {name:>8} {default_ms:>11.2f} {fast_ms:>10.2f} {default_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Synthetic WhatsApp chat export generator for benchmarks.
+
+Generates exports in each layout WhatsAppParser.message_patterns supports,
+with configurable phone number density and repetition:
+
+    python benchmarks/chat_generator.py chat.txt --lines 1000000 --layout dashed \
+        --phone-density 0.3 --unique-phones 5000
+"""
+
+import argparse
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional
+
+# Line template and default timestamp format for each message pattern
+LAYOUTS = {
+    "bracketed": ("[{ts}] {sender}: {message}", "%d/%m/%y, %H:%M:%S"),  # [DD/MM/YY, HH:MM:SS] Name: Message
+    "dashed": ("{ts} - {sender}: {message}", "%d/%m/%Y, %H:%M"),  # DD/MM/YYYY, HH:MM - Name: Message
+    "hyphen_date": ("{ts} - {sender}: {message}", "%d-%m-%Y, %H:%M:%S"),  # DD-MM-YYYY, HH:MM:SS - Name: Message
+}
+
+# Nigerian mobile prefixes (after +234), so generated numbers validate
+NG_PREFIXES = ["703", "706", "803", "806", "810", "813", "814", "816", "903", "906", "805", "807", "815", "905"]
+
+NAMES = ["Adeola", "Chinedu", "Ngozi", "Tunde", "Amaka", "Emeka", "Funke", "Ibrahim", "Chioma", "Segun"]
+
+MESSAGES = [
+    "Good morning everyone",
+    "Please what is the price?",
+    "Is this still available?",
+    "Delivered, thank you!",
+    "Send me a DM for details",
+    "How much for delivery to Lekki?",
+    "Payment confirmed 🙏",
+]
+
+PHONE_MESSAGES = [
+    "Call me on {phone}",
+    "My number is {phone}",
+    "Contact {phone} for orders",
+    "Add {phone} to the group please",
+    "WhatsApp {phone} or {phone2}",
+]
+
+
+@dataclass
+class ChatSpec:
+    lines: int = 10_000
+    layout: str = "dashed"
+    timestamp_format: Optional[str] = None  # defaults to the layout's format
+    phone_density: float = 0.2  # share of messages that contain a phone number
+    sender_phone_ratio: float = 0.5  # share of senders shown as unsaved numbers
+    unique_phones: int = 2_000  # size of the number pool; smaller means more repetition
+    continuation_ratio: float = 0.05  # share of lines that continue a multi-line message
+    seed: int = 42
+
+
+def phone_pool(size: int, rng: random.Random) -> List[str]:
+    """Generate size distinct E.164 Nigerian mobile numbers"""
+    pool = set()
+    while len(pool) < size:
+        pool.add(f"+234{rng.choice(NG_PREFIXES)}{rng.randrange(10 ** 7):07d}")
+    return sorted(pool)
+
+
+def render_phone(phone: str, rng: random.Random) -> str:
+    """Write a number the way people type it in chats"""
+    national = phone[4:]
+    style = rng.randrange(4)
+    if style == 0:
+        return phone
+    if style == 1:
+        return f"+234 {national[:3]} {national[3:6]} {national[6:]}"
+    if style == 2:
+        return f"0{national}"
+    return phone[1:]
+
+
+def generate_chat_lines(spec: ChatSpec) -> Iterator[str]:
+    """Yield the lines of a synthetic chat export"""
+    rng = random.Random(spec.seed)
+    template, default_format = LAYOUTS[spec.layout]
+    timestamp_format = spec.timestamp_format or default_format
+    phones = phone_pool(spec.unique_phones, rng)
+    start = datetime(2024, 1, 1, 8, 0)
+
+    for i in range(spec.lines):
+        if i and rng.random() < spec.continuation_ratio:
+            yield rng.choice(MESSAGES)
+            continue
+
+        if rng.random() < spec.sender_phone_ratio:
+            sender = render_phone(rng.choice(phones), rng)
+        else:
+            sender = rng.choice(NAMES)
+
+        if rng.random() < spec.phone_density:
+            message = rng.choice(PHONE_MESSAGES).format(
+                phone=render_phone(rng.choice(phones), rng),
+                phone2=render_phone(rng.choice(phones), rng)
+            )
+        else:
+            message = rng.choice(MESSAGES)
+
+        ts = (start + timedelta(seconds=37 * i)).strftime(timestamp_format)
+        yield template.format(ts=ts, sender=sender, message=message)
+
+
+def write_chat(path: str, spec: ChatSpec) -> None:
+    """Write a synthetic chat export to path without holding it in memory"""
+    with open(path, "w", encoding="utf-8") as f:
+        for line in generate_chat_lines(spec):
+            f.write(line)
+            f.write("\n")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("path")
+    arg_parser.add_argument("--lines", type=int, default=ChatSpec.lines)
+    arg_parser.add_argument("--layout", choices=sorted(LAYOUTS), default=ChatSpec.layout)
+    arg_parser.add_argument("--timestamp-format", default=None)
+    arg_parser.add_argument("--phone-density", type=float, default=ChatSpec.phone_density)
+    arg_parser.add_argument("--sender-phone-ratio", type=float, default=ChatSpec.sender_phone_ratio)
+    arg_parser.add_argument("--unique-phones", type=int, default=ChatSpec.unique_phones)
+    arg_parser.add_argument("--seed", type=int, default=ChatSpec.seed)
+    args = arg_parser.parse_args()
+
+    write_chat(args.path, ChatSpec(
+        lines=args.lines,
+        layout=args.layout,
+        timestamp_format=args.timestamp_format,
+        phone_density=args.phone_density,
+        sender_phone_ratio=args.sender_phone_ratio,
+        unique_phones=args.unique_phones,
+        seed=args.seed
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the parser and the API.
+
+Parser cases run on synthetic exports (see chat_generator.py) in every
+layout and report lines/sec, phone validations/sec and peak RSS; each case
+runs in a fresh process so RSS and caches are not shared between cases.
+With --api the FastAPI app is driven in-process against a local MongoDB
+(MONGO_URL) to time import, list and export requests.
+
+Results are written as JSON. Pass --baseline with an earlier result file
+to exit non-zero when any metric regresses by more than --tolerance:
+
+    python benchmarks/run_suite.py --output new.json --baseline old.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "backend"))
+sys.path.insert(0, str(BENCH_DIR))
+
+from chat_generator import LAYOUTS, ChatSpec, phone_pool, render_phone, write_chat
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_API_SIZES = [1_000, 10_000, 100_000]
+LIST_REQUESTS = 20
+
+# Whether a larger value of a metric is an improvement
+HIGHER_IS_BETTER = {
+    "lines_per_sec": True,
+    "validations_per_sec": True,
+    "cached_lookups_per_sec": True,
+    "peak_rss_mb": False,
+    "import_ms": False,
+    "list_p50_ms": False,
+    "list_p95_ms": False,
+    "export_ms": False,
+    "export_csv_ms": False,
+    "export_ndjson_ms": False,
+}
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_parser_case(path: str, mode: str, results) -> None:
+    """Parse one export inside a child process and report its metrics"""
+    logging.disable(logging.WARNING)
+    from phone_cache import shared_phone_cache
+    from whatsapp_parser import WhatsAppParser, iter_decoded_lines
+
+    parser = WhatsAppParser()
+    started = time.perf_counter()
+    if mode == "file":
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        lines = content.count("\n")
+        leads, _ = parser.parse_chat_file(content, path)
+    else:
+        with open(path, "rb") as f:
+            leads, _ = parser.parse_chat_stream(iter_decoded_lines(f), path)
+        with open(path, "rb") as f:
+            lines = sum(1 for _ in f)
+    seconds = time.perf_counter() - started
+
+    cache = shared_phone_cache.stats()
+    results.put({
+        "seconds": seconds,
+        "lines_per_sec": lines / seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "leads": len(leads),
+        "phone_validations": cache["misses"],
+        "phone_lookups": cache["hits"] + cache["misses"],
+    })
+
+
+def run_parser_case(path: str, mode: str) -> Dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_run_parser_case, args=(path, mode, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def bench_parser(sizes: List[int], workdir: str, spec_overrides: Dict[str, Any]) -> Dict[str, Any]:
+    metrics: Dict[str, Any] = {}
+    for layout in LAYOUTS:
+        for size in sizes:
+            path = os.path.join(workdir, f"{layout}_{size}.txt")
+            write_chat(path, ChatSpec(lines=size, layout=layout, **spec_overrides))
+            for mode in ("file", "stream"):
+                result = run_parser_case(path, mode)
+                metrics[f"parser.{layout}.{size}.{mode}"] = result
+                print(
+                    f"parser {layout:>12} {size:>9} {mode:>6}: "
+                    f"{result['lines_per_sec']:>10,.0f} lines/s "
+                    f"{result['peak_rss_mb']:>8.1f} MB peak "
+                    f"{result['phone_validations']:>8} validations"
+                )
+            os.remove(path)
+    return metrics
+
+
+def bench_phone_validation(count: int = 20_000) -> Dict[str, Any]:
+    """Rate of uncached phonenumbers validation and of cached lookups"""
+    logging.disable(logging.WARNING)
+    from phone_cache import PhoneNormalizationCache
+    from whatsapp_parser import WhatsAppParser
+
+    rng = random.Random(7)
+    phones = phone_pool(count // 2, rng)
+    candidates = [render_phone(phone, rng) for phone in phones]
+    # Half of the candidates are digit runs that fail validation
+    candidates += [f"{rng.randrange(10 ** 11, 10 ** 12)}" for _ in range(count - len(candidates))]
+    cleaned = [c.replace(" ", "") for c in candidates]
+
+    parser = WhatsAppParser(phone_cache=PhoneNormalizationCache(count))
+    started = time.perf_counter()
+    for candidate in cleaned:
+        parser._normalize_phone(candidate)
+    validate_seconds = time.perf_counter() - started
+
+    for candidate in candidates:
+        parser._extract_and_validate_phone(candidate)
+    started = time.perf_counter()
+    for candidate in candidates:
+        parser._extract_and_validate_phone(candidate)
+    cached_seconds = time.perf_counter() - started
+
+    result = {
+        "validations_per_sec": count / validate_seconds,
+        "cached_lookups_per_sec": count / cached_seconds,
+    }
+    print(
+        f"phone validation: {result['validations_per_sec']:,.0f}/s uncached, "
+        f"{result['cached_lookups_per_sec']:,.0f}/s cached"
+    )
+    return {"phones.validation": result}
+
+
+async def bench_api(sizes: List[int], workdir: str, spec_overrides: Dict[str, Any]) -> Dict[str, Any]:
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ["DB_NAME"] = os.environ.get("BENCH_DB_NAME", "leadengine_bench")
+    # Every size is another import; keep the free tier's monthly quota out of the way
+    os.environ.setdefault("DEFAULT_SUBSCRIPTION_TIER", "business")
+    logging.disable(logging.WARNING)
+
+    import httpx
+    import server
+
+    await server.client.drop_database(os.environ["DB_NAME"])
+    await server.app.router.startup()
+    metrics: Dict[str, Any] = {}
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+            for size in sizes:
+                await server.db.leads.delete_many({})
+                await server.db.imports.delete_many({})
+                await server.db.user_stats.delete_many({})
+
+                path = os.path.join(workdir, f"api_{size}.txt")
+                write_chat(path, ChatSpec(lines=size, **spec_overrides))
+                with open(path, "rb") as f:
+                    started = time.perf_counter()
+                    response = await http.post("/api/import/upload", files={"file": ("chat.txt", f, "text/plain")})
+                    import_ms = (time.perf_counter() - started) * 1000
+                response.raise_for_status()
+                os.remove(path)
+
+                list_timings = []
+                for _ in range(LIST_REQUESTS):
+                    started = time.perf_counter()
+                    response = await http.get("/api/leads", params={"limit": 100, "is_saved": False})
+                    list_timings.append((time.perf_counter() - started) * 1000)
+                    response.raise_for_status()
+                list_timings.sort()
+
+                started = time.perf_counter()
+                response = await http.post("/api/leads/export-vcf/stream", json={})
+                export_ms = (time.perf_counter() - started) * 1000
+                response.raise_for_status()
+                leads = response.text.count("BEGIN:VCARD")
+
+                export_timings = {}
+                for name in ("csv", "ndjson"):
+                    started = time.perf_counter()
+                    response = await http.post(f"/api/leads/export-{name}/stream", json={})
+                    export_timings[name] = (time.perf_counter() - started) * 1000
+                    response.raise_for_status()
+
+                result = {
+                    "import_ms": import_ms,
+                    "list_p50_ms": statistics.median(list_timings),
+                    "list_p95_ms": list_timings[int(len(list_timings) * 0.95) - 1],
+                    "export_ms": export_ms,
+                    "export_csv_ms": export_timings["csv"],
+                    "export_ndjson_ms": export_timings["ndjson"],
+                    "leads": leads,
+                }
+                metrics[f"api.{size}"] = result
+                print(
+                    f"api {size:>9}: import {import_ms:>9.1f} ms, list p50 {result['list_p50_ms']:.1f} ms "
+                    f"p95 {result['list_p95_ms']:.1f} ms, export vcf {export_ms:.1f} ms csv {export_timings['csv']:.1f} ms "
+                    f"ndjson {export_timings['ndjson']:.1f} ms ({leads} leads)"
+                )
+    finally:
+        await server.app.router.shutdown()
+    return metrics
+
+
+def find_regressions(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """List metrics that got worse than baseline by more than tolerance"""
+    regressions = []
+    for case, values in current["metrics"].items():
+        previous = baseline.get("metrics", {}).get(case)
+        if not previous:
+            continue
+        for metric, higher_is_better in HIGHER_IS_BETTER.items():
+            if metric not in values or not previous.get(metric):
+                continue
+            change = (values[metric] - previous[metric]) / previous[metric]
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{case}.{metric}: {previous[metric]:.2f} -> {values[metric]:.2f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Parser and API benchmark suite")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                            help="parser export sizes in lines (up to 5000000)")
+    arg_parser.add_argument("--api", action="store_true", help="also benchmark the API against MONGO_URL")
+    arg_parser.add_argument("--api-sizes", type=int, nargs="+", default=DEFAULT_API_SIZES)
+    arg_parser.add_argument("--phone-density", type=float, default=ChatSpec.phone_density)
+    arg_parser.add_argument("--unique-phones", type=int, default=ChatSpec.unique_phones)
+    arg_parser.add_argument("--output", default="bench_results.json")
+    arg_parser.add_argument("--baseline", help="earlier result file to compare against")
+    arg_parser.add_argument("--tolerance", type=float, default=0.15,
+                            help="allowed relative regression before failing (default 0.15)")
+    args = arg_parser.parse_args()
+
+    spec_overrides = {"phone_density": args.phone_density, "unique_phones": args.unique_phones}
+    results: Dict[str, Any] = {
+        "meta": {
+            "started_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            **spec_overrides,
+        },
+        "metrics": {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results["metrics"].update(bench_phone_validation())
+        results["metrics"].update(bench_parser(args.sizes, workdir, spec_overrides))
+        if args.api:
+            results["metrics"].update(asyncio.run(bench_api(args.api_sizes, workdir, spec_overrides)))
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print("Regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,10 +11,13 @@ import {
 import { SafeAreaView } from 'react-native-safe-area-context';
 import { Ionicons } from '@expo/vector-icons';
 import * as DocumentPicker from 'expo-document-picker';
-import * as FileSystem from 'expo-file-system';
-import { parseImport } from '../../utils/api';
+import { uploadImportInBackground, getImportStatus } from '../../utils/api';
 import { useRouter } from 'expo-router';
 
+const STATUS_POLL_INTERVAL = 1000;
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
 export default function ImportScreen() {
   const router = useRouter();
   const [importing, setImporting] = useState(false);
@@ -24,7 +27,7 @@ export default function ImportScreen() {
   const pickFiles = async () => {
     try {
       const result = await DocumentPicker.getDocumentAsync({
-        type: 'text/plain',
+        type: ['text/plain', 'application/zip'],
         multiple: true,
         copyToCacheDirectory: true,
       });
@@ -55,17 +58,24 @@ export default function ImportScreen() {
         const file = selectedFiles[i];
         setProgress(`Processing ${i + 1}/${selectedFiles.length}: ${file.name}`);
 
-        // Read file content
-        const content = await FileSystem.readAsStringAsync(file.uri);
-        
-        // Convert to base64
-        const base64Content = btoa(content);
+        // Upload, then follow the server-side import until it finishes
+        const job = await uploadImportInBackground(file);
+        let status = await getImportStatus(job.import_id);
+        while (status.status === 'processing') {
+          setProgress(
+            `Processing ${i + 1}/${selectedFiles.length}: ${file.name}\n` +
+            `${status.lines_processed} lines, ${status.numbers_found} numbers found`
+          );
+          await sleep(STATUS_POLL_INTERVAL);
+          status = await getImportStatus(job.import_id);
+        }
+
+        if (status.status === 'failed') {
+          throw new Error(status.error_message || `Import of ${file.name} failed`);
+        }
 
-        // Parse import
-        const result = await parseImport(file.name, base64Content);
-        
-        totalLeads += result.total_count;
-        totalDuplicates += result.duplicates_removed;
+        totalLeads += status.numbers_found;
+        totalDuplicates += status.result?.duplicates_removed ?? 0;
       }
 
       setProgress('Import complete!');
@@ -139,7 +139,9 @@ export default function HomeScreen() {
               <View style={styles.usageProgress} />
             </View>
             <Text style={styles.usageText}>
-              {stats?.subscription_usage.imports || 0} / 2 imports this month
+              {stats?.subscription_usage.imports || 0} /{' '}
+              {stats?.subscription_usage.imports_limit === -1 ? 'unlimited' : stats?.subscription_usage.imports_limit ?? 2}{' '}
+              imports this month
             </Text>
           </View>
         </View>
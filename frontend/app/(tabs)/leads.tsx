@@ -20,10 +20,21 @@ import * as Sharing from 'expo-sharing';
 import { getLeads, bulkSaveLeads, exportVCF } from '../../utils/api';
 import { Lead } from '../../types';
 
+const PAGE_SIZE = 100;
+// Only what the list and bulk save read; the rest of each lead is not fetched
+const LIST_FIELDS = 'phone_number,display_name,source_chat,is_saved,saved_name';
+// The backend rejects phone number searches with fewer digits
+const MIN_PHONE_SEARCH_DIGITS = 3;
+
+const isShortPhoneSearch = (search: string) =>
+  /^[\d\s+().-]+$/.test(search) && search.replace(/\D/g, '').length < MIN_PHONE_SEARCH_DIGITS;
+
 export default function LeadsScreen() {
   const [leads, setLeads] = useState<Lead[]>([]);
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
+  const [nextAfter, setNextAfter] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedLeads, setSelectedLeads] = useState<Set<string>>(new Set());
   const [searchQuery, setSearchQuery] = useState('');
   const [filter, setFilter] = useState<'all' | 'unsaved' | 'saved'>('unsaved');
@@ -33,22 +44,27 @@ export default function LeadsScreen() {
   const [namingSuffix, setNamingSuffix] = useState('');
   const [autoNumbering, setAutoNumbering] = useState(true);
 
+  const buildParams = useCallback(() => {
+    const params: any = { limit: PAGE_SIZE, count: 'none', fields: LIST_FIELDS };
+    
+    if (filter === 'unsaved') {
+      params.is_saved = false;
+    } else if (filter === 'saved') {
+      params.is_saved = true;
+    }
+    
+    if (searchQuery && !isShortPhoneSearch(searchQuery)) {
+      params.search = searchQuery;
+    }
+
+    return params;
+  }, [filter, searchQuery]);
+
   const fetchLeads = useCallback(async () => {
     try {
-      const params: any = { limit: 1000 };
-      
-      if (filter === 'unsaved') {
-        params.is_saved = false;
-      } else if (filter === 'saved') {
-        params.is_saved = true;
-      }
-      
-      if (searchQuery) {
-        params.search = searchQuery;
-      }
-
-      const data = await getLeads(params);
+      const data = await getLeads(buildParams());
       setLeads(data.leads);
+      setNextAfter(data.next_after);
     } catch (error) {
       console.error('Error fetching leads:', error);
       Alert.alert('Error', 'Failed to fetch leads');
@@ -56,7 +72,24 @@ export default function LeadsScreen() {
       setLoading(false);
       setRefreshing(false);
     }
-  }, [filter, searchQuery]);
+  }, [buildParams]);
+
+  const loadMore = async () => {
+    if (!nextAfter || loadingMore) {
+      return;
+    }
+
+    setLoadingMore(true);
+    try {
+      const data = await getLeads({ ...buildParams(), after: nextAfter });
+      setLeads(prev => [...prev, ...data.leads]);
+      setNextAfter(data.next_after);
+    } catch (error) {
+      console.error('Error fetching more leads:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   useEffect(() => {
     fetchLeads();
@@ -90,24 +123,6 @@ export default function LeadsScreen() {
     return status === 'granted';
   };
 
-  const generateContactName = (lead: Lead, index: number): string => {
-    let name = namingPrefix;
-    
-    if (autoNumbering) {
-      name += `-${String(index + 1).padStart(3, '0')}`;
-    }
-    
-    if (lead.display_name && lead.display_name !== lead.phone_number) {
-      name += `-${lead.display_name}`;
-    }
-    
-    if (namingSuffix) {
-      name += `-${namingSuffix}`;
-    }
-    
-    return name;
-  };
-
   const handleBulkSave = async () => {
     if (selectedLeads.size === 0) {
       Alert.alert('No Selection', 'Please select leads to save');
@@ -124,12 +139,16 @@ export default function LeadsScreen() {
     setSaving(true);
 
     try {
-      const selectedLeadsArray = leads.filter(lead => selectedLeads.has(lead._id));
+      // Names (and their numbers) are assigned by the backend
+      const { leads: namedLeads } = await bulkSaveLeads(Array.from(selectedLeads), {
+        prefix: namingPrefix,
+        suffix: namingSuffix,
+        auto_numbering: autoNumbering,
+      });
       let successCount = 0;
 
-      for (let i = 0; i < selectedLeadsArray.length; i++) {
-        const lead = selectedLeadsArray[i];
-        const contactName = generateContactName(lead, i);
+      for (const lead of namedLeads) {
+        const contactName = lead.saved_name || lead.phone_number;
 
         try {
           // Create contact on device
@@ -146,9 +165,6 @@ export default function LeadsScreen() {
         }
       }
 
-      // Update backend
-      await bulkSaveLeads(Array.from(selectedLeads));
-
       Alert.alert(
         'Success!',
         `Saved ${successCount} of ${selectedLeads.size} contacts to your device`
@@ -317,6 +333,11 @@ export default function LeadsScreen() {
         refreshControl={
           <RefreshControl refreshing={refreshing} onRefresh={onRefresh} />
         }
+        onEndReached={loadMore}
+        onEndReachedThreshold={0.5}
+        ListFooterComponent={
+          loadingMore ? <ActivityIndicator style={styles.footerLoader} color="#2563eb" /> : null
+        }
       />
 
       {/* Bottom Action Bar */}
@@ -392,7 +413,8 @@ export default function LeadsScreen() {
             <View style={styles.previewBox}>
               <Text style={styles.previewLabel}>Preview:</Text>
               <Text style={styles.previewText}>
-                {generateContactName(leads[0] || { phone_number: '+234xxx', display_name: 'John' } as Lead, 0)}
+                {/* Format only: the backend assigns the actual names and numbers */}
+                {[namingPrefix, autoNumbering && '001', 'John', namingSuffix].filter(Boolean).join('-')}
               </Text>
             </View>
 
@@ -428,6 +450,9 @@ const styles = StyleSheet.create({
     flex: 1,
     backgroundColor: '#f9fafb',
   },
+  footerLoader: {
+    paddingVertical: 16,
+  },
   loadingContainer: {
     flex: 1,
     justifyContent: 'center',
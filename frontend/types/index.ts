@@ -8,8 +8,10 @@ export interface Lead {
   last_seen: string;
   import_id: string;
   is_saved: boolean;
+  saved_name?: string;
   tags: string[];
   notes?: string;
+  change_seq?: number;
   created_at: string;
 }
 
@@ -26,6 +28,37 @@ export interface ImportParseResponse {
   duplicates_removed: number;
 }
 
+export interface ImportSummaryResponse {
+  import_id: string;
+  total_count: number;
+  duplicates_removed: number;
+}
+
+export interface ImportJobResponse {
+  import_id: string;
+  status: string;
+}
+
+export interface ImportStatus {
+  import_id: string;
+  filename: string;
+  status: 'processing' | 'completed' | 'failed' | 'rolled_back';
+  lines_processed: number;
+  numbers_found: number;
+  leads_written: number;
+  error_message?: string;
+  result?: ImportParseResponse | ImportSummaryResponse;
+}
+
+// Mirrors LeadFilterRequest in backend/models.py
+export interface LeadFilter {
+  date_from?: string;
+  date_to?: string;
+  is_saved?: boolean;
+  tags?: string[];
+  search_query?: string;
+}
+
 export interface LeadStats {
   total_leads: number;
   unsaved_leads: number;
@@ -35,6 +68,8 @@ export interface LeadStats {
   subscription_usage: {
     imports: number;
     contacts_saved: number;
+    imports_limit: number;
+    contacts_limit: number;
     tier: string;
   };
 }
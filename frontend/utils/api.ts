@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { Lead, ImportParseResponse, LeadStats } from '../types';
+import { Lead, LeadFilter, NamingConfig, ImportParseResponse, ImportJobResponse, ImportStatus, LeadStats } from '../types';
 import Constants from 'expo-constants';
 
 const API_URL = Constants.expoConfig?.extra?.EXPO_PUBLIC_BACKEND_URL || process.env.EXPO_PUBLIC_BACKEND_URL;
@@ -22,20 +22,123 @@ export const parseImport = async (filename: string, content: string): Promise<Im
   return response.data;
 };
 
+type UploadFile = { uri: string; name: string; mimeType?: string };
+
+const buildUploadForm = (file: UploadFile): FormData => {
+  const formData = new FormData();
+  formData.append('file', {
+    uri: file.uri,
+    name: file.name,
+    type: file.mimeType || 'text/plain',
+  } as any);
+  return formData;
+};
+
+export const uploadImport = async (file: UploadFile): Promise<ImportParseResponse> => {
+  const response = await api.post('/import/upload', buildUploadForm(file), {
+    headers: {
+      'Content-Type': 'multipart/form-data',
+    },
+  });
+  return response.data;
+};
+
+// Queues the import on the server; poll getImportStatus for progress
+export const uploadImportInBackground = async (file: UploadFile): Promise<ImportJobResponse> => {
+  const formData = buildUploadForm(file);
+  formData.append('background', 'true');
+  formData.append('response_mode', 'summary');
+
+  const response = await api.post('/import/upload', formData, {
+    headers: {
+      'Content-Type': 'multipart/form-data',
+    },
+  });
+  return response.data;
+};
+
+export const getImportStatus = async (importId: string): Promise<ImportStatus> => {
+  const response = await api.get(`/imports/${importId}`);
+  return response.data;
+};
+
+export const getImportLeads = async (
+  importId: string,
+  params: { after?: string; limit?: number } = {}
+): Promise<{ leads: Lead[]; next_after: string | null }> => {
+  const response = await api.get(`/imports/${importId}/leads`, { params });
+  return response.data;
+};
+
+// Last response per URL and params, revalidated with its ETag so an
+// unchanged list or stats refetch comes back as an empty 304
+const MAX_REVALIDATED = 50;
+const revalidated = new Map<string, { etag: string; data: any }>();
+
+const getRevalidated = async (url: string, params?: object): Promise<any> => {
+  const key = `${url}?${JSON.stringify(params ?? {})}`;
+  const cached = revalidated.get(key);
+  const response = await api.get(url, {
+    params,
+    headers: cached ? { 'If-None-Match': cached.etag } : undefined,
+    validateStatus: (status) => (status >= 200 && status < 300) || (status === 304 && !!cached),
+  });
+  if (response.status === 304 && cached) {
+    return cached.data;
+  }
+  const etag = response.headers.etag;
+  if (etag) {
+    revalidated.delete(key);
+    revalidated.set(key, { etag, data: response.data });
+    if (revalidated.size > MAX_REVALIDATED) {
+      revalidated.delete(revalidated.keys().next().value as string);
+    }
+  }
+  return response.data;
+};
+
 // Lead APIs
 export const getLeads = async (params: {
   is_saved?: boolean;
   search?: string;
   skip?: number;
   limit?: number;
-}): Promise<{ leads: Lead[]; total: number }> => {
-  const response = await api.get('/leads', { params });
+  after?: string;
+  count?: 'exact' | 'estimated' | 'none';
+  fields?: string;
+}): Promise<{ leads: Lead[]; total: number | null; next_after: string | null }> => {
+  return getRevalidated('/leads', params);
+};
+
+export const queryLeads = async (
+  filter: LeadFilter,
+  params: { limit?: number; after?: string; count?: 'exact' | 'none'; fields?: string } = {}
+): Promise<{ leads: Lead[]; total: number | null; next_after: string | null }> => {
+  const response = await api.post('/leads/query', filter, { params });
+  return response.data;
+};
+
+// Pass the previous next_token as since; a 410 means sync again without it
+export const getLeadChanges = async (params: {
+  since?: string;
+  limit?: number;
+  fields?: string;
+}): Promise<{ leads: Lead[]; deleted: string[]; next_token: string; has_more: boolean }> => {
+  const response = await api.get('/leads/changes', { params });
   return response.data;
 };
 
-export const bulkSaveLeads = async (leadIds: string[]): Promise<{ success: boolean; updated_count: number }> => {
+export const bulkSaveLeads = async (
+  leadIds: string[],
+  namingConfig?: Partial<NamingConfig>
+): Promise<{
+  success: boolean;
+  updated_count: number;
+  leads: { _id: string; phone_number: string; saved_name: string | null }[];
+}> => {
   const response = await api.post('/leads/bulk-save', {
     lead_ids: leadIds,
+    naming_config: namingConfig,
   });
   return response.data;
 };
@@ -48,8 +151,7 @@ export const exportVCF = async (leadIds: string[]): Promise<{ success: boolean;
 };
 
 export const getStats = async (): Promise<LeadStats> => {
-  const response = await api.get('/leads/stats');
-  return response.data;
+  return getRevalidated('/leads/stats');
 };
 
 export const deleteLead = async (leadId: string): Promise<{ success: boolean }> => {
@@ -57,6 +159,19 @@ export const deleteLead = async (leadId: string): Promise<{ success: boolean }>
   return response.data;
 };
 
+export const bulkDeleteLeads = async (
+  selection: { lead_ids: string[] } | { filter: LeadFilter }
+): Promise<{ success: boolean; deleted_count: number }> => {
+  const response = await api.post('/leads/bulk-delete', selection);
+  return response.data;
+};
+
+// Deletes the leads only this import found
+export const rollbackImport = async (importId: string): Promise<{ success: boolean; deleted_count: number }> => {
+  const response = await api.delete(`/imports/${importId}`);
+  return response.data;
+};
+
 // Health check
 export const healthCheck = async (): Promise<any> => {
   const response = await api.get('/health');
@@ -0,0 +1,113 @@
+"""
+Query plans of filtered lead queries: every common LeadFilterRequest
+combination must be served by an index scan, never a collection scan.
+
+Runs against the MongoDB at MONGO_URL (default mongodb://localhost:27017)
+and is skipped when none is reachable.
+"""
+
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from bson import ObjectId
+from pymongo import IndexModel, MongoClient
+from pymongo.errors import PyMongoError
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from lead_query import FILTER_SORT, LEAD_QUERY_INDEXES, build_lead_filter_query, query_after
+from lead_search import SEARCH_KEYS_FIELD, build_search_keys
+from models import LeadFilterRequest
+
+USER_ID = "plan_user"
+
+# Same definition as the search index created at startup in server.py
+SEARCH_INDEX = IndexModel([("user_id", 1), (SEARCH_KEYS_FIELD, 1)], name="user_search_keys")
+
+NOW = datetime(2025, 6, 1)
+
+
+@pytest.fixture(scope="module")
+def leads():
+    client = MongoClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"), serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip("no MongoDB reachable at MONGO_URL")
+
+    db_name = f"lead_query_plans_{uuid.uuid4().hex[:8]}"
+    collection = client[db_name].leads
+    collection.create_indexes(LEAD_QUERY_INDEXES + [SEARCH_INDEX])
+    names = ["Adeola", "Chinedu", "Ngozi", "Tunde"]
+    collection.insert_many([
+        {
+            "user_id": USER_ID if i % 4 else "other_user",
+            "phone_number": f"+234803{i:07d}",
+            "display_name": names[i % len(names)],
+            "first_seen": NOW - timedelta(hours=i),
+            "last_seen": NOW,
+            "is_saved": i % 3 == 0,
+            "tags": ["vip"] if i % 10 == 0 else [],
+            SEARCH_KEYS_FIELD: build_search_keys(f"+234803{i:07d}", names[i % len(names)]),
+        }
+        for i in range(2000)
+    ])
+    yield collection
+    client.drop_database(db_name)
+    client.close()
+
+
+def plan_stages(plan) -> list:
+    """Every stage name in an explain plan tree, classic or slot-based"""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for key in ("inputStage", "inputStages", "queryPlan", "winningPlan", "shards"):
+            if key in plan:
+                stages.extend(plan_stages(plan[key]))
+    elif isinstance(plan, list):
+        for child in plan:
+            stages.extend(plan_stages(child))
+    return stages
+
+
+FILTERS = {
+    "no filter": LeadFilterRequest(),
+    "unsaved": LeadFilterRequest(is_saved=False),
+    "saved": LeadFilterRequest(is_saved=True),
+    "date range": LeadFilterRequest(date_from=NOW - timedelta(days=30), date_to=NOW),
+    "unsaved in date range": LeadFilterRequest(is_saved=False, date_from=NOW - timedelta(days=7)),
+    "tag": LeadFilterRequest(tags=["vip"]),
+    "tags and saved": LeadFilterRequest(tags=["vip", "lagos"], is_saved=True),
+    "name search": LeadFilterRequest(search_query="ade"),
+    "phone search with date": LeadFilterRequest(search_query="0803000", date_from=NOW - timedelta(days=30)),
+}
+
+
+@pytest.mark.parametrize("lead_filter", FILTERS.values(), ids=FILTERS.keys())
+def test_filter_uses_index(leads, lead_filter):
+    query = build_lead_filter_query(USER_ID, lead_filter)
+    explain = leads.find(query).sort(FILTER_SORT).limit(100).explain()
+    stages = plan_stages(explain["queryPlanner"]["winningPlan"])
+    assert "IXSCAN" in stages
+    assert "COLLSCAN" not in stages
+
+
+@pytest.mark.parametrize("lead_filter", [FILTERS["no filter"], FILTERS["unsaved in date range"]],
+                         ids=["no filter", "unsaved in date range"])
+def test_next_page_uses_index(leads, lead_filter):
+    query = query_after(build_lead_filter_query(USER_ID, lead_filter), NOW - timedelta(hours=100), ObjectId())
+    explain = leads.find(query).sort(FILTER_SORT).limit(100).explain()
+    stages = plan_stages(explain["queryPlanner"]["winningPlan"])
+    assert "IXSCAN" in stages
+    assert "COLLSCAN" not in stages
+
+
+def test_unfiltered_query_does_not_sort_in_memory(leads):
+    explain = leads.find(build_lead_filter_query(USER_ID, None)).sort(FILTER_SORT).limit(100).explain()
+    assert "SORT" not in plan_stages(explain["queryPlanner"]["winningPlan"])
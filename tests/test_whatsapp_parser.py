@@ -0,0 +1,167 @@
+"""
+Regression tests for WhatsAppParser on a fixed corpus: the leads found in
+each chat (phone, sender name when the sender was the number, first_seen)
+must not change as the candidate scanner and validation are reworked.
+Phone numbers are compared as sets, since the order numbers within one
+message are found in is not part of the contract.
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from phone_cache import PhoneNormalizationCache
+from whatsapp_parser import ParseStats, WhatsAppParser
+
+# name: (chat content, {phone: (display_name, first_seen)})
+CORPUS = {
+    "bracketed with seconds": (
+        "[25/12/2024, 10:30:15] +234 803 123 4567: Hello, I saw your ad\n"
+        "[25/12/2024, 10:31:02] Shop: Thanks! Call 08031234568 or +234-805-765-4321\n"
+        "[25/12/2024, 10:32:40] +234 803 123 4567: My brother's line is 2348091112233\n",
+        {
+            "+2348031234567": ("+234 803 123 4567", datetime(2024, 12, 25, 10, 30, 15)),
+            "+2348031234568": (None, datetime(2024, 12, 25, 10, 31, 2)),
+            "+2348057654321": (None, datetime(2024, 12, 25, 10, 31, 2)),
+            "+2348091112233": (None, datetime(2024, 12, 25, 10, 32, 40)),
+        },
+    ),
+    "dash with short year": (
+        "25/12/24, 09:05 - Shop: Welcome to the group\n"
+        "25/12/24, 09:06 - +44 7911 123456: Hi from London\n"
+        "25/12/24, 09:07 - Ada: Reach me on 07061234567, not 0706123456\n",
+        {
+            "+447911123456": ("+44 7911 123456", datetime(2024, 12, 25, 9, 6)),
+            "+2347061234567": (None, datetime(2024, 12, 25, 9, 7)),
+        },
+    ),
+    "hyphenated date": (
+        "01-02-2025, 14:00:00 - Tunde: Order for 09011223344\n"
+        "01-02-2025, 14:01:30 - +234 701 234 5678: Same here\n",
+        {
+            "+2349011223344": (None, datetime(2025, 2, 1, 14, 0)),
+            "+2347012345678": ("+234 701 234 5678", datetime(2025, 2, 1, 14, 1, 30)),
+        },
+    ),
+    "12-hour clock": (
+        "12/31/24, 11:59 PM - Bola: New year promo, text 08051112222\n"
+        "1/1/25, 12:01 AM - +1 415 555 2671: Happy new year\n",
+        {
+            "+2348051112222": (None, datetime(2024, 12, 31, 23, 59)),
+            "+14155552671": ("+1 415 555 2671", datetime(2025, 1, 1, 0, 1)),
+        },
+    ),
+    # Continuation lines of a multi-line message are not scanned
+    "multi-line messages": (
+        "[03/03/2025, 08:00:00] Shop: Price list:\n"
+        "Item A - 5000\n"
+        "call 08039998888 for delivery\n"
+        "[03/03/2025, 08:05:00] +234 802 111 2222: How much is item A?\n"
+        "also my wife: 08023334444\n",
+        {
+            "+2348021112222": ("+234 802 111 2222", datetime(2025, 3, 3, 8, 5)),
+        },
+    ),
+    "phone edge cases": (
+        "[04/04/2025, 10:00:00] Shop: too short 0803123, too long 2348031234567890123\n"
+        # Digit runs are validated as they are, so an order number that is
+        # also a valid number is kept
+        "[04/04/2025, 10:01:00] Shop: order #12345678901 and invoice 00000000000\n"
+        "[04/04/2025, 10:02:00] Shop: same number thrice 08031230000 / +2348031230000 / 2348031230000\n"
+        "[04/04/2025, 10:03:00] Shop: spaced +234 803 123 0001 and glued +2348031230002x\n"
+        "[04/04/2025, 10:04:00] Shop: ghana +233 244 123 456\n",
+        {
+            "+12345678901": (None, datetime(2025, 4, 4, 10, 1)),
+            "+2348031230000": (None, datetime(2025, 4, 4, 10, 2)),
+            "+2348031230001": (None, datetime(2025, 4, 4, 10, 3)),
+            "+2348031230002": (None, datetime(2025, 4, 4, 10, 3)),
+            "+233244123456": (None, datetime(2025, 4, 4, 10, 4)),
+        },
+    ),
+}
+
+# One message in each of the parser's timestamp formats, all 25 Dec 2024 at 22:30
+TIMESTAMP_LINES = {
+    "%d/%m/%Y, %H:%M:%S": ("[25/12/2024, 22:30:15] +234 803 123 4567: hi", datetime(2024, 12, 25, 22, 30, 15)),
+    "%d/%m/%y, %H:%M:%S": ("[25/12/24, 22:30:15] +234 803 123 4567: hi", datetime(2024, 12, 25, 22, 30, 15)),
+    "%d/%m/%Y, %H:%M": ("25/12/2024, 22:30 - +234 803 123 4567: hi", datetime(2024, 12, 25, 22, 30)),
+    "%d/%m/%y, %H:%M": ("25/12/24, 22:30 - +234 803 123 4567: hi", datetime(2024, 12, 25, 22, 30)),
+    "%d-%m-%Y, %H:%M:%S": ("25-12-2024, 22:30:15 - +234 803 123 4567: hi", datetime(2024, 12, 25, 22, 30, 15)),
+    "%d-%m-%y, %H:%M:%S": ("25-12-24, 22:30:15 - +234 803 123 4567: hi", datetime(2024, 12, 25, 22, 30, 15)),
+    "%m/%d/%Y, %I:%M:%S %p": ("[12/25/2024, 10:30:15 PM] +234 803 123 4567: hi", datetime(2024, 12, 25, 22, 30, 15)),
+    "%m/%d/%y, %I:%M %p": ("12/25/24, 10:30 PM - +234 803 123 4567: hi", datetime(2024, 12, 25, 22, 30)),
+}
+
+
+def make_parser() -> WhatsAppParser:
+    # A cache of its own, so results and validation counts don't depend on earlier tests
+    return WhatsAppParser(PhoneNormalizationCache())
+
+
+def as_expected(leads):
+    return {lead.phone_number: (lead.display_name, lead.first_seen) for lead in leads}
+
+
+@pytest.mark.parametrize("content, expected", CORPUS.values(), ids=CORPUS.keys())
+def test_parse_chat_file(content, expected):
+    leads, _ = make_parser().parse_chat_file(content)
+    assert len(leads) == len(expected)
+    assert as_expected(leads) == expected
+
+
+@pytest.mark.parametrize("content, expected", CORPUS.values(), ids=CORPUS.keys())
+def test_parse_chat_stream_matches_file(content, expected):
+    leads, _ = make_parser().parse_chat_stream(iter(content.split("\n")))
+    assert as_expected(leads) == expected
+
+
+def test_sender_names():
+    _, senders = make_parser().parse_chat_file(CORPUS["dash with short year"][0])
+    assert senders == {"Shop", "+44 7911 123456", "Ada"}
+
+
+@pytest.mark.parametrize("timestamp_format", TIMESTAMP_LINES.keys())
+def test_timestamp_formats(timestamp_format):
+    line, first_seen = TIMESTAMP_LINES[timestamp_format]
+    parser = make_parser()
+    assert parser.detect_format([line]).timestamp_format == timestamp_format
+    leads, _ = parser.parse_chat_file(line)
+    assert as_expected(leads) == {"+2348031234567": ("+234 803 123 4567", first_seen)}
+
+
+@pytest.mark.parametrize("timestamp_format", TIMESTAMP_LINES.keys())
+def test_timestamp_formats_outside_detected_format(timestamp_format):
+    # Lines not in the file's detected format fall back to every known format
+    line, first_seen = TIMESTAMP_LINES[timestamp_format]
+    content = "[01/01/2020, 00:00:00] Shop: hi\n" * 3 + line
+    leads, _ = make_parser().parse_chat_file(content)
+    assert as_expected(leads) == {"+2348031234567": ("+234 803 123 4567", first_seen)}
+
+
+def test_parallel_parse_matches_file():
+    content = "".join(content for content, _ in CORPUS.values())
+    expected, expected_senders = make_parser().parse_chat_file(content)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leads, senders = make_parser().parse_chat_file_parallel(content, executor=executor, chunk_size=256)
+    assert as_expected(leads) == as_expected(expected)
+    assert senders == expected_senders
+
+
+def test_reposted_numbers_are_validated_once():
+    content = "".join(
+        f"[05/05/2025, 09:{minute:02d}:00] Shop: call 08031234567 or +234 803 765 4321\n"
+        for minute in range(60)
+    )
+    stats = ParseStats()
+    leads, _ = make_parser().parse_chat_file(content, stats=stats)
+    assert as_expected(leads) == {
+        "+2348031234567": (None, datetime(2025, 5, 5, 9, 0)),
+        "+2348037654321": (None, datetime(2025, 5, 5, 9, 0)),
+    }
+    # 120 occurrences, two distinct candidates
+    assert stats.validations == 2